@@ -0,0 +1,39 @@
+"""Composite indexes for inventory history and purchase history
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-18
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0001"
+down_revision: Union[str, None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # GET /inventory/history/{sweet_id}: filter by sweet, range and page on created_at
+    op.create_index(
+        "ix_inventory_logs_sweet_created_id",
+        "inventory_logs",
+        ["sweet_id", "created_at", "id"],
+        if_not_exists=True
+    )
+    # GET /inventory/purchases: a user's purchases newest first
+    op.create_index(
+        "ix_purchase_history_user_date_id",
+        "purchase_history",
+        ["user_id", "purchase_date", "id"],
+        if_not_exists=True
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_purchase_history_user_date_id", table_name="purchase_history")
+    op.drop_index("ix_inventory_logs_sweet_created_id", table_name="inventory_logs")
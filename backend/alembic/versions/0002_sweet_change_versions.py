@@ -0,0 +1,100 @@
+"""Catalog change versions and delete tombstones for sweets
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-18
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0002"
+down_revision: Union[str, None] = "0001"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+TRIGGERS = [
+    """
+    CREATE TRIGGER IF NOT EXISTS sweets_version_ai AFTER INSERT ON sweets BEGIN
+        UPDATE catalog_version SET version = version + 1 WHERE id = 1;
+        UPDATE sweets SET version = (SELECT version FROM catalog_version WHERE id = 1) WHERE id = new.id;
+        DELETE FROM sweet_tombstones WHERE sweet_id = new.id;
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS sweets_version_au AFTER UPDATE ON sweets
+    WHEN new.version = old.version BEGIN
+        UPDATE catalog_version SET version = version + 1 WHERE id = 1;
+        UPDATE sweets SET version = (SELECT version FROM catalog_version WHERE id = 1) WHERE id = new.id;
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS sweets_version_ad AFTER DELETE ON sweets BEGIN
+        UPDATE catalog_version SET version = version + 1 WHERE id = 1;
+        INSERT OR REPLACE INTO sweet_tombstones(sweet_id, version)
+        VALUES (old.id, (SELECT version FROM catalog_version WHERE id = 1));
+    END
+    """,
+]
+
+
+def upgrade() -> None:
+    # Databases built by init_db.py (create_all) already have some or all of
+    # this schema, so every step checks first
+    bind = op.get_bind()
+    inspector = sa.inspect(bind)
+    tables = inspector.get_table_names()
+    
+    if "version" not in {column["name"] for column in inspector.get_columns("sweets")}:
+        op.add_column("sweets", sa.Column("version", sa.Integer(), nullable=False, server_default="0"))
+        # Existing sweets get distinct versions; the counter continues after them
+        op.execute("UPDATE sweets SET version = id")
+    op.create_index("ix_sweets_version", "sweets", ["version"], if_not_exists=True)
+    
+    if "sweet_tombstones" not in tables:
+        op.create_table(
+            "sweet_tombstones",
+            sa.Column("sweet_id", sa.Integer(), primary_key=True, autoincrement=False),
+            sa.Column("version", sa.Integer(), nullable=False),
+        )
+    op.create_index("ix_sweet_tombstones_version", "sweet_tombstones", ["version"], if_not_exists=True)
+    
+    if "catalog_version" not in tables:
+        op.create_table(
+            "catalog_version",
+            sa.Column("id", sa.Integer(), primary_key=True),
+            sa.Column("version", sa.Integer(), nullable=False),
+        )
+    
+    # The counter must start at or after every version already handed out
+    latest = max(
+        bind.execute(sa.text("SELECT COALESCE(MAX(version), 0) FROM sweets")).scalar(),
+        bind.execute(sa.text("SELECT COALESCE(MAX(version), 0) FROM sweet_tombstones")).scalar()
+    )
+    if bind.execute(sa.text("SELECT 1 FROM catalog_version WHERE id = 1")).first() is None:
+        op.execute(sa.text("INSERT INTO catalog_version (id, version) VALUES (1, :latest)").bindparams(latest=latest))
+    else:
+        op.execute(
+            sa.text("UPDATE catalog_version SET version = :latest WHERE id = 1 AND version < :latest")
+            .bindparams(latest=latest)
+        )
+    
+    if bind.dialect.name == "sqlite":
+        for statement in TRIGGERS:
+            op.execute(statement)
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name == "sqlite":
+        for trigger in ("sweets_version_ai", "sweets_version_au", "sweets_version_ad"):
+            op.execute(f"DROP TRIGGER IF EXISTS {trigger}")
+    op.drop_table("catalog_version")
+    op.drop_index("ix_sweet_tombstones_version", table_name="sweet_tombstones")
+    op.drop_table("sweet_tombstones")
+    op.drop_index("ix_sweets_version", table_name="sweets")
+    op.drop_column("sweets", "version")
@@ -0,0 +1,57 @@
+"""Daily sales rollup per sweet
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-18
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0003"
+down_revision: Union[str, None] = "0002"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Databases built by init_db.py (create_all) may already have the table
+    bind = op.get_bind()
+    if "daily_sweet_sales" not in sa.inspect(bind).get_table_names():
+        op.create_table(
+            "daily_sweet_sales",
+            sa.Column("sale_date", sa.Date(), primary_key=True),
+            sa.Column("sweet_id", sa.Integer(), primary_key=True, autoincrement=False),
+            sa.Column("units", sa.Integer(), nullable=False),
+            sa.Column("revenue", sa.Numeric(12, 2), nullable=False),
+            sa.Column("purchases", sa.Integer(), nullable=False),
+        )
+    op.create_index(
+        "ix_daily_sweet_sales_sweet_date",
+        "daily_sweet_sales",
+        ["sweet_id", "sale_date"],
+        if_not_exists=True
+    )
+    
+    # Seed an empty rollup from the purchase history recorded so far; SQLite
+    # stores dates as text and CAST(... AS DATE) would give a number there
+    if bind.execute(sa.text("SELECT 1 FROM daily_sweet_sales LIMIT 1")).first() is not None:
+        return
+    day = "date(purchase_date)" if bind.dialect.name == "sqlite" else "CAST(purchase_date AS DATE)"
+    op.execute(
+        f"""
+        INSERT INTO daily_sweet_sales (sale_date, sweet_id, units, revenue, purchases)
+        SELECT {day}, sweet_id, SUM(quantity), SUM(total_price), COUNT(*)
+        FROM purchase_history
+        GROUP BY {day}, sweet_id
+        """
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_daily_sweet_sales_sweet_date", table_name="daily_sweet_sales")
+    op.drop_table("daily_sweet_sales")
@@ -0,0 +1,65 @@
+"""Full-text search index for sweets
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-18
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0004"
+down_revision: Union[str, None] = "0003"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# Databases set up by init_db.py already have these, hence IF NOT EXISTS
+STATEMENTS = [
+    """
+    CREATE VIRTUAL TABLE IF NOT EXISTS sweets_fts USING fts5(
+        name, category, description,
+        content='sweets', content_rowid='id'
+    )
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS sweets_fts_ai AFTER INSERT ON sweets BEGIN
+        INSERT INTO sweets_fts(rowid, name, category, description)
+        VALUES (new.id, new.name, new.category, new.description);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS sweets_fts_ad AFTER DELETE ON sweets BEGIN
+        INSERT INTO sweets_fts(sweets_fts, rowid, name, category, description)
+        VALUES ('delete', old.id, old.name, old.category, old.description);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS sweets_fts_au AFTER UPDATE OF name, category, description ON sweets BEGIN
+        INSERT INTO sweets_fts(sweets_fts, rowid, name, category, description)
+        VALUES ('delete', old.id, old.name, old.category, old.description);
+        INSERT INTO sweets_fts(rowid, name, category, description)
+        VALUES (new.id, new.name, new.category, new.description);
+    END
+    """,
+]
+
+
+def upgrade() -> None:
+    if op.get_bind().dialect.name != "sqlite":
+        return
+    for statement in STATEMENTS:
+        op.execute(statement)
+    # Index the sweets that existed before the triggers
+    op.execute("INSERT INTO sweets_fts(sweets_fts) VALUES ('rebuild')")
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name != "sqlite":
+        return
+    for trigger in ("sweets_fts_ai", "sweets_fts_ad", "sweets_fts_au"):
+        op.execute(f"DROP TRIGGER IF EXISTS {trigger}")
+    op.execute("DROP TABLE IF EXISTS sweets_fts")
@@ -3,16 +3,24 @@ from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from sqlalchemy.orm import Session
 from app.database import get_db
 from app.utils.security import decode_token
-from app.repositories.user_repository import UserRepository
+from app.repositories.user_repository import UserRepository, principal_cache
+from app.schemas.auth import Principal
 
 security = HTTPBearer()
 
 
-async def get_current_user(
+def get_current_user(
     credentials: HTTPAuthorizationCredentials = Depends(security),
     db: Session = Depends(get_db)
 ):
-    """Get current authenticated user from JWT token"""
+    """Get current authenticated user from JWT token
+    
+    This is a plain `def` on purpose: FastAPI runs it in the threadpool, so the
+    synchronous user lookup never blocks the event loop. The user is returned
+    as a cached Principal, so most requests never touch the users table, and
+    the session's connection is released straight after a lookup so a route
+    with its own session holds only one.
+    """
     token = credentials.credentials
     
     try:
@@ -29,14 +37,24 @@ async def get_current_user(
             detail="Invalid authentication credentials"
         )
     
-    user_repo = UserRepository(db)
-    user = user_repo.get_by_username(username)
+    def load():
+        user_repo = UserRepository(db)
+        try:
+            user = user_repo.get_by_username(username)
+        finally:
+            # Hand the connection back now rather than when the response,
+            # possibly a long stream, finishes
+            db.close()
+        
+        if user is None:
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="User not found"
+            )
+        return Principal.model_validate(user)
     
-    if user is None:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="User not found"
-        )
+    # Not stored if a user update or delete cleared the cache mid-load
+    user = principal_cache.get_or_load(username, load)
     
     if not user.is_active:
         raise HTTPException(
@@ -3,7 +3,10 @@ from sqlalchemy.orm import Session
 from app.database import get_db
 from app.schemas.user import UserCreate
 from app.schemas.auth import Token
+from app.api.deps import get_current_admin
 from app.services.auth_service import AuthService
+from app.utils.exceptions import ServiceUnavailableException
+from app.utils.password_pool import password_hasher
 import logging
 
 logger = logging.getLogger(__name__)
@@ -11,17 +14,22 @@ router = APIRouter()
 
 
 @router.post("/register", response_model=Token)
-def register(user_create: UserCreate, db: Session = Depends(get_db)):
+async def register(user_create: UserCreate, db: Session = Depends(get_db)):
     """Register a new user"""
     try:
         auth_service = AuthService(db)
-        token = auth_service.register(user_create)
+        token = await auth_service.register(user_create)
         return token
     except ValueError as e:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail=str(e)
         )
+    except ServiceUnavailableException as e:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=str(e)
+        )
     except Exception as e:
         logger.error(f"Registration error: {e}", exc_info=True)
         raise HTTPException(
@@ -31,10 +39,17 @@ def register(user_create: UserCreate, db: Session = Depends(get_db)):
 
 
 @router.post("/login", response_model=Token)
-def login(username: str, password: str, db: Session = Depends(get_db)):
+async def login(username: str, password: str, db: Session = Depends(get_db)):
     """Login user"""
     auth_service = AuthService(db)
-    token = auth_service.login(username, password)
+    
+    try:
+        token = await auth_service.login(username, password)
+    except ServiceUnavailableException as e:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=str(e)
+        )
     
     if not token:
         raise HTTPException(
@@ -43,3 +58,12 @@ def login(username: str, password: str, db: Session = Depends(get_db)):
         )
     
     return token
+
+
+@router.get("/hasher/stats")
+def get_password_hasher_stats(current_user = Depends(get_current_admin)):
+    """Get password hashing pool counters (admin only)"""
+    return {
+        "success": True,
+        "data": password_hasher.stats()
+    }
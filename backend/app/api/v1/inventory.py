@@ -1,10 +1,18 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Body
+from datetime import datetime
+from fastapi import APIRouter, Depends, HTTPException, status, Body, Query
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
 from pydantic import BaseModel, ConfigDict
-from app.database import get_db
-from app.schemas.purchase import PurchaseHistoryCreate
+from typing import List
+from app.config import settings
+from app.database import get_db, get_read_db
+from app.schemas.purchase import PurchaseHistoryCreate, CheckoutRequest
 from app.api.deps import get_current_user, get_current_admin
 from app.services.inventory_service import InventoryService
+from app.services.group_commit import group_commit_writer
+from app.services.stock_events import stock_events
+from app.utils.exceptions import ServiceUnavailableException
+from app.utils.serialization import FastJSONResponse
 
 router = APIRouter()
 
@@ -17,6 +25,11 @@ class RestockRequest(BaseModel):
     notes: str = ""
 
 
+class BulkRestockRequest(BaseModel):
+    items: List[RestockRequest]
+    notes: str = ""
+
+
 @router.post("/purchase")
 def purchase_sweet(
     purchase_data: PurchaseHistoryCreate,
@@ -24,7 +37,7 @@ def purchase_sweet(
     db: Session = Depends(get_db)
 ):
     """Purchase a sweet"""
-    inventory_service = InventoryService(db)
+    inventory_service = group_commit_writer if settings.GROUP_COMMIT_ENABLED else InventoryService(db)
     
     try:
         purchase = inventory_service.purchase_sweet(
@@ -42,6 +55,38 @@ def purchase_sweet(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail=str(e)
         )
+    except ServiceUnavailableException as e:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=str(e)
+        )
+
+
+@router.post("/checkout")
+def checkout(
+    checkout_data: CheckoutRequest,
+    current_user = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """Purchase every item in a cart in one all-or-nothing transaction"""
+    inventory_service = InventoryService(db)
+    
+    try:
+        purchases = inventory_service.checkout(
+            user_id=current_user.id,
+            items=[item.model_dump() for item in checkout_data.items]
+        )
+        return {
+            "success": True,
+            "message": "Checkout successful",
+            "data": purchases,
+            "total_price": sum(float(purchase.total_price) for purchase in purchases)
+        }
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
 
 
 @router.post("/restock")
@@ -51,7 +96,7 @@ def restock_sweet(
     db: Session = Depends(get_db)
 ):
     """Restock a sweet (admin only)"""
-    inventory_service = InventoryService(db)
+    inventory_service = group_commit_writer if settings.GROUP_COMMIT_ENABLED else InventoryService(db)
     
     print(f"DEBUG: Restock request received")
     print(f"DEBUG: sweet_id={restock_data.sweet_id}, quantity={restock_data.quantity}, notes={restock_data.notes}")
@@ -74,52 +119,115 @@ def restock_sweet(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail=str(e)
         )
+    except ServiceUnavailableException as e:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=str(e)
+        )
 
 
-@router.get("/history/{sweet_id}")
-def get_inventory_history(
-    sweet_id: int,
+@router.post("/restock/bulk")
+def bulk_restock(
+    manifest: BulkRestockRequest,
     current_user = Depends(get_current_admin),
     db: Session = Depends(get_db)
 ):
-    """Get inventory history for a sweet"""
+    """Restock every line of a delivery manifest in one transaction (admin only)"""
     inventory_service = InventoryService(db)
-    history = inventory_service.get_inventory_history(sweet_id)
     
+    try:
+        results = inventory_service.bulk_restock(
+            items=[item.model_dump() for item in manifest.items],
+            user_id=current_user.id,
+            notes=manifest.notes
+        )
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    
+    restocked = sum(1 for result in results if result["status"] == "restocked")
+    return {
+        "success": True,
+        "message": f"Restocked {restocked} of {len(results)} lines",
+        "data": results
+    }
+
+
+@router.get("/stock/stream")
+async def stream_stock_updates():
+    """Push {sweet_id, quantity} stock level changes as Server-Sent Events"""
+    return StreamingResponse(
+        stock_events.stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
+@router.get("/stock/stats")
+def get_stock_stream_stats(current_user = Depends(get_current_admin)):
+    """Get stock stream subscriber and delivery counters (admin only)"""
     return {
         "success": True,
-        "data": history
+        "data": stock_events.stats()
     }
 
 
+@router.get("/history/{sweet_id}")
+def get_inventory_history(
+    sweet_id: int,
+    since: datetime = None,
+    until: datetime = None,
+    action: str = None,
+    limit: int = Query(100, ge=1, le=1000),
+    cursor: str = None,
+    current_user = Depends(get_current_admin),
+    db: Session = Depends(get_read_db)
+):
+    """Get inventory history for a sweet, newest first, one page at a time"""
+    inventory_service = InventoryService(db)
+    
+    try:
+        history, next_cursor = inventory_service.get_inventory_history(
+            sweet_id, since, until, action, limit, cursor
+        )
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    
+    return FastJSONResponse({
+        "success": True,
+        "data": [log._asdict() for log in history],
+        "next_cursor": next_cursor
+    })
+
+
 @router.get("/purchases")
 def get_user_purchases(
+    limit: int = Query(100, ge=1, le=1000),
+    cursor: str = None,
     current_user = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_read_db)
 ):
-    """Get all purchases for the current user"""
-    from app.models.purchase import PurchaseHistory
-    purchases = db.query(PurchaseHistory).filter(
-        PurchaseHistory.user_id == current_user.id
-    ).order_by(PurchaseHistory.purchase_date.desc()).all()
+    """Get the current user's purchases, newest first, one page at a time"""
+    inventory_service = InventoryService(db)
     
-    # Serialize with sweet name
-    result = []
-    for purchase in purchases:
-        result.append({
-            "id": purchase.id,
-            "user_id": purchase.user_id,
-            "sweet_id": purchase.sweet_id,
-            "sweet_name": purchase.sweet.name if purchase.sweet else "N/A",
-            "quantity": purchase.quantity,
-            "total_price": float(purchase.total_price),
-            "purchased_at": purchase.purchase_date.isoformat()
-        })
+    try:
+        purchases, next_cursor = inventory_service.get_user_purchases(current_user.id, limit, cursor)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
     
-    return {
+    return FastJSONResponse({
         "success": True,
-        "data": result
-    }
+        "data": purchases,
+        "next_cursor": next_cursor
+    })
 
 
 @router.delete("/purchases")
@@ -0,0 +1,89 @@
+from datetime import date
+from fastapi import APIRouter, Depends, HTTPException, status, Query
+from sqlalchemy.orm import Session
+from app.database import get_read_db
+from app.api.deps import get_current_admin
+from app.services.sales_service import SalesService
+from app.utils.serialization import FastJSONResponse
+
+router = APIRouter()
+
+
+@router.get("/summary")
+def get_sales_summary(
+    start: date = None,
+    end: date = None,
+    current_user = Depends(get_current_admin),
+    db: Session = Depends(get_read_db)
+):
+    """Get total units and revenue over a date range, last 30 days by default (admin only)"""
+    sales_service = SalesService(db)
+    
+    try:
+        start, end, summary = sales_service.get_summary(start, end)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    
+    return FastJSONResponse({
+        "success": True,
+        "start": start,
+        "end": end,
+        "data": summary
+    })
+
+
+@router.get("/daily")
+def get_daily_sales(
+    start: date = None,
+    end: date = None,
+    sweet_id: int = None,
+    current_user = Depends(get_current_admin),
+    db: Session = Depends(get_read_db)
+):
+    """Get units and revenue per day, optionally for one sweet (admin only)"""
+    sales_service = SalesService(db)
+    
+    try:
+        start, end, days = sales_service.get_daily(start, end, sweet_id)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    
+    return FastJSONResponse({
+        "success": True,
+        "start": start,
+        "end": end,
+        "data": days
+    })
+
+
+@router.get("/sweets")
+def get_sales_by_sweet(
+    start: date = None,
+    end: date = None,
+    limit: int = Query(100, ge=1, le=1000),
+    current_user = Depends(get_current_admin),
+    db: Session = Depends(get_read_db)
+):
+    """Get units and revenue per sweet, best sellers first (admin only)"""
+    sales_service = SalesService(db)
+    
+    try:
+        start, end, sweets = sales_service.get_by_sweet(start, end, limit)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    
+    return FastJSONResponse({
+        "success": True,
+        "start": start,
+        "end": end,
+        "data": sweets
+    })
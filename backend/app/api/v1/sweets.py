@@ -1,29 +1,181 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+import codecs
+import csv
+import inspect
+from fastapi import APIRouter, Depends, HTTPException, status, File, Query, Request, Response, UploadFile
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from typing import List
-from app.database import get_db
-from app.schemas.sweet import Sweet, SweetCreate, SweetUpdate
+from typing import List, Union
+from app.database import get_catalog_db, get_db, get_read_db
+from app.schemas.sweet import Sweet, SweetBulkUpdate, SweetCreate, SweetUpdate
+from app.schemas.response import PaginatedResponse
 from app.api.deps import get_current_user, get_current_admin
-from app.services.sweet_service import SweetService
+from app.config import settings
+from app.services.sweet_service import AsyncSweetService, SweetService, catalog_cache, catalog_flight
+from app.services.catalog_import_service import CatalogImportService, iter_csv_rows, iter_ndjson_rows
+from app.services.catalog_export_service import CatalogExportService
+from app.utils.streaming import gzip_stream
+from app.utils.serialization import FastJSONResponse
+from app.utils.conditional import cache_headers, is_not_modified, make_etag
 
 router = APIRouter()
 
 
-@router.get("/", response_model=List[Sweet])
-def get_sweets(
+async def _read(method, *args):
+    """Await an AsyncSweetService read, or run a SweetService one in the threadpool"""
+    if inspect.iscoroutinefunction(method):
+        return await method(*args)
+    return await run_in_threadpool(method, *args)
+
+
+@router.get("/", response_model=Union[List[Sweet], PaginatedResponse[Sweet]])
+async def get_sweets(
+    request: Request,
+    skip: int = Query(0, ge=0),
+    limit: int = Query(100, ge=1, le=10000),
+    category: str = None,
+    order_by: str = None,
+    cursor: str = None,
+    fields: str = None,
+    db: Union[AsyncSession, Session] = Depends(get_catalog_db)
+):
+    """Get all sweets with optional filtering
+    
+    Passing `order_by` (id, category or price) or a `cursor` switches to keyset
+    pagination and returns a paginated response carrying `next_cursor`.
+    `fields=id,name,price` returns only those fields (id is always included).
+    Responses carry an ETag from the catalog change version, which every
+    insert, update and delete bumps, and a matching If-None-Match gets a 304.
+    There is no Last-Modified: deletes do not move the latest updated_at, so
+    If-Modified-Since could not be trusted.
+    Reads go through the async engine when it is enabled.
+    """
+    if isinstance(db, AsyncSession):
+        sweet_service = AsyncSweetService(db)
+    else:
+        sweet_service = SweetService(db)
+    
+    version = await _read(sweet_service.get_catalog_version)
+    headers = cache_headers(make_etag(version, request.url.query))
+    if is_not_modified(request, headers["ETag"]):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    
+    try:
+        if order_by is None and cursor is None:
+            sweets = await _read(sweet_service.get_all_sweets, skip, limit, category, fields)
+            return FastJSONResponse(sweets, headers=headers)
+        
+        sweets, next_cursor = await _read(sweet_service.get_sweets_page, limit, category, order_by, cursor, fields)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    
+    return FastJSONResponse({
+        "success": True,
+        "message": "Sweets retrieved successfully",
+        "data": sweets,
+        "total": None,
+        "page": None,
+        "per_page": limit,
+        "next_cursor": next_cursor
+    }, headers=headers)
+
+
+@router.get("/search", response_model=List[Sweet])
+def search_sweets(
+    q: str = "",
+    category: str = None,
+    min_price: float = None,
+    max_price: float = None,
     skip: int = 0,
     limit: int = 100,
-    category: str = None,
-    db: Session = Depends(get_db)
+    fields: str = None,
+    db: Session = Depends(get_read_db)
+):
+    """Search sweets by name, category and description"""
+    sweet_service = SweetService(db)
+    
+    try:
+        sweets = sweet_service.search_sweets(q, skip, limit, category, min_price, max_price, fields)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    
+    return FastJSONResponse(sweets)
+
+
+@router.get("/changes")
+def get_sweet_changes(
+    since: int = 0,
+    limit: int = Query(1000, ge=1, le=10000),
+    db: Session = Depends(get_read_db)
 ):
-    """Get all sweets with optional filtering"""
+    """Get sweets created, updated or deleted since a catalog version
+    
+    Start with since=0, apply `data` in order, then call again with the
+    returned `version`; keep going while `has_more` is true.
+    """
     sweet_service = SweetService(db)
-    return sweet_service.get_all_sweets(skip, limit, category)
+    
+    try:
+        result = sweet_service.get_changes(since, limit)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    
+    return FastJSONResponse({
+        "success": True,
+        "data": result["changes"],
+        "version": result["version"],
+        "has_more": result["has_more"]
+    })
+
+
+@router.get("/export")
+def export_sweets(
+    format: str = Query("ndjson", pattern="^(csv|ndjson)$"),
+    gzip: bool = False,
+    current_user = Depends(get_current_admin),
+    db: Session = Depends(get_read_db)
+):
+    """Stream the whole catalog as NDJSON or CSV, optionally gzipped (admin only)"""
+    export_service = CatalogExportService(db)
+    
+    if format == "csv":
+        chunks, media_type = export_service.iter_csv(), "text/csv"
+    else:
+        chunks, media_type = export_service.iter_ndjson(), "application/x-ndjson"
+    
+    headers = {"Content-Disposition": f'attachment; filename="sweets.{format}"'}
+    if gzip:
+        chunks = gzip_stream(chunks)
+        headers["Content-Encoding"] = "gzip"
+    
+    return StreamingResponse(chunks, media_type=media_type, headers=headers)
+
+
+@router.get("/cache/stats")
+def get_catalog_cache_stats(current_user = Depends(get_current_admin)):
+    """Get catalog read cache and single-flight counters (admin only)"""
+    return {
+        "success": True,
+        "data": {**catalog_cache.stats(), "single_flight": catalog_flight.stats()}
+    }
 
 
 @router.get("/{sweet_id}", response_model=Sweet)
-def get_sweet(sweet_id: int, db: Session = Depends(get_db)):
-    """Get a specific sweet by ID"""
+def get_sweet(request: Request, sweet_id: int, fields: str = None, db: Session = Depends(get_read_db)):
+    """Get a specific sweet by ID, optionally only the given `fields`
+    
+    Supports conditional GET on the sweet's updated_at.
+    """
     sweet_service = SweetService(db)
     sweet = sweet_service.get_sweet_by_id(sweet_id)
     
@@ -33,7 +185,22 @@ def get_sweet(sweet_id: int, db: Session = Depends(get_db)):
             detail="Sweet not found"
         )
     
-    return sweet
+    headers = cache_headers(make_etag(sweet.id, sweet.updated_at.isoformat(), fields), sweet.updated_at)
+    if is_not_modified(request, headers["ETag"], sweet.updated_at):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    
+    if not fields:
+        return FastJSONResponse(sweet.model_dump(mode="json"), headers=headers)
+    
+    try:
+        sweet = sweet_service.get_sweet_fields(sweet_id, fields)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    
+    return FastJSONResponse(sweet, headers=headers)
 
 
 @router.post("/", response_model=Sweet)
@@ -47,6 +214,60 @@ def create_sweet(
     return sweet_service.create_sweet(sweet_create)
 
 
+@router.post("/import")
+def import_sweets(
+    file: UploadFile = File(...),
+    format: str = Query(None, pattern="^(csv|ndjson)$"),
+    batch_size: int = Query(settings.IMPORT_BATCH_SIZE, ge=1, le=50000),
+    current_user = Depends(get_current_admin),
+    db: Session = Depends(get_db)
+):
+    """Bulk upsert sweets from a CSV or NDJSON upload (admin only)"""
+    if format is None:
+        format = "csv" if (file.filename or "").lower().endswith(".csv") else "ndjson"
+    
+    lines = codecs.iterdecode(file.file, "utf-8-sig")
+    rows = iter_csv_rows(lines) if format == "csv" else iter_ndjson_rows(lines)
+    
+    try:
+        report = CatalogImportService(db).import_rows(rows, batch_size)
+    except (UnicodeDecodeError, csv.Error) as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Could not parse upload: {e}"
+        )
+    
+    return {
+        "success": report["failed"] == 0,
+        "message": f"Imported {report['inserted'] + report['updated']} sweet(s), {report['failed']} failed",
+        "data": report
+    }
+
+
+@router.patch("/bulk")
+def bulk_update_sweets(
+    request: SweetBulkUpdate,
+    current_user = Depends(get_current_admin),
+    db: Session = Depends(get_db)
+):
+    """Update many sweets in one transaction (admin only)"""
+    sweet_service = SweetService(db)
+    
+    try:
+        result = sweet_service.bulk_update_sweets(request)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    
+    return {
+        "success": True,
+        "message": f"Updated {result['updated']} sweets",
+        "data": result
+    }
+
+
 @router.put("/{sweet_id}", response_model=Sweet)
 def update_sweet(
     sweet_id: int,
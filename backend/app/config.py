@@ -1,5 +1,5 @@
 from pydantic_settings import BaseSettings
-from typing import List
+from typing import List, Optional
 import os
 
 
@@ -7,11 +7,59 @@ class Settings(BaseSettings):
     # Database
     DATABASE_URL: str = "sqlite:///./sweet_shop.db"
     
+    # SQLite storage profile (legacy, balanced, durable or bulk); the
+    # individual pragmas below override the profile when set. durable keeps
+    # synchronous=FULL; balanced and bulk trade commit durability for speed
+    SQLITE_PROFILE: str = "durable"
+    SQLITE_JOURNAL_MODE: Optional[str] = None
+    SQLITE_SYNCHRONOUS: Optional[str] = None
+    SQLITE_CACHE_SIZE: Optional[int] = None
+    SQLITE_MMAP_SIZE: Optional[int] = None
+    SQLITE_TEMP_STORE: Optional[str] = None
+    SQLITE_BUSY_TIMEOUT_MS: Optional[int] = None
+    
+    # Read-only engine for GET routes (SQLite files only)
+    READ_ENGINE_ENABLED: bool = True
+    READ_POOL_SIZE: int = 20
+    
+    # Opt-in asyncio engine, used by the catalog list route (GET /sweets/);
+    # the URL defaults to DATABASE_URL on its async driver
+    ASYNC_DATABASE_ENABLED: bool = False
+    ASYNC_DATABASE_URL: Optional[str] = None
+    
     # Security
     SECRET_KEY: str = "your-secret-key-change-in-production"
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
     
+    # Password hashing pool (set PASSWORD_HASH_WORKERS to 0 to hash on threads);
+    # calls beyond PASSWORD_HASH_MAX_PENDING are rejected with 503
+    PASSWORD_HASH_WORKERS: int = 2
+    PASSWORD_HASH_MAX_PENDING: int = 32
+    
+    # Catalog read cache (set CATALOG_CACHE_SIZE to 0 to disable)
+    CATALOG_CACHE_SIZE: int = 1024
+    CATALOG_CACHE_TTL_SECONDS: float = 30.0
+    
+    # Group commit: queue purchases/restocks and commit them in batches
+    GROUP_COMMIT_ENABLED: bool = False
+    GROUP_COMMIT_MAX_BATCH: int = 64
+    GROUP_COMMIT_MAX_DELAY_MS: float = 2.0
+    GROUP_COMMIT_RESULT_TIMEOUT_SECONDS: float = 30.0
+    
+    # Authenticated principal cache (set PRINCIPAL_CACHE_SIZE to 0 to disable)
+    PRINCIPAL_CACHE_SIZE: int = 10000
+    PRINCIPAL_CACHE_TTL_SECONDS: float = 30.0
+    
+    # Bulk catalog import
+    IMPORT_BATCH_SIZE: int = 1000
+    
+    # Stock update stream: per-subscriber limit on distinct pending sweets
+    # before it is told to resync, and how long to gather updates per push
+    STOCK_EVENTS_MAX_PENDING: int = 1000
+    STOCK_EVENTS_COALESCE_MS: float = 100.0
+    STOCK_EVENTS_KEEPALIVE_SECONDS: float = 15.0
+    
     # CORS
     CORS_ORIGINS: List[str] = [
         "http://localhost:3000",
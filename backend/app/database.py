@@ -1,28 +1,186 @@
 from sqlalchemy import create_engine, event
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker, declarative_base
 from app.config import settings
 
+# Pragmas applied to every new SQLite connection. WAL lets readers run
+# alongside the writer, and busy_timeout makes writers wait for the lock
+# instead of failing with "database is locked". durable, the default, syncs
+# every commit like SQLite's own default; balanced (synchronous=NORMAL) can
+# lose the last commits on power loss, and bulk (OFF) can corrupt the file.
+SQLITE_PROFILES = {
+    "legacy": {},
+    "balanced": {
+        "journal_mode": "WAL",
+        "synchronous": "NORMAL",
+        "cache_size": -65536,
+        "mmap_size": 268435456,
+        "temp_store": "MEMORY",
+        "busy_timeout": 5000,
+    },
+    "durable": {
+        "journal_mode": "WAL",
+        "synchronous": "FULL",
+        "cache_size": -65536,
+        "mmap_size": 268435456,
+        "temp_store": "MEMORY",
+        "busy_timeout": 5000,
+    },
+    "bulk": {
+        "journal_mode": "WAL",
+        "synchronous": "OFF",
+        "cache_size": -262144,
+        "mmap_size": 1073741824,
+        "temp_store": "MEMORY",
+        "busy_timeout": 30000,
+    },
+}
+
+
+def sqlite_pragmas(profile: str = settings.SQLITE_PROFILE) -> dict:
+    """Get the pragmas of a storage profile with any Settings overrides applied"""
+    if profile not in SQLITE_PROFILES:
+        raise ValueError(f"Unknown SQLite profile '{profile}'")
+    
+    pragmas = dict(SQLITE_PROFILES[profile])
+    overrides = {
+        "journal_mode": settings.SQLITE_JOURNAL_MODE,
+        "synchronous": settings.SQLITE_SYNCHRONOUS,
+        "cache_size": settings.SQLITE_CACHE_SIZE,
+        "mmap_size": settings.SQLITE_MMAP_SIZE,
+        "temp_store": settings.SQLITE_TEMP_STORE,
+        "busy_timeout": settings.SQLITE_BUSY_TIMEOUT_MS,
+    }
+    pragmas.update({name: value for name, value in overrides.items() if value is not None})
+    return pragmas
+
+
+def configure_sqlite(sync_engine, pragmas: dict) -> None:
+    """Enable foreign keys and apply `pragmas` on every new connection"""
+    @event.listens_for(sync_engine, "connect")
+    def set_sqlite_pragma(dbapi_conn, connection_record):
+        cursor = dbapi_conn.cursor()
+        cursor.execute("PRAGMA foreign_keys=ON")
+        for name, value in pragmas.items():
+            cursor.execute(f"PRAGMA {name}={value}")
+        cursor.close()
+
+
 engine = create_engine(
     settings.DATABASE_URL,
     connect_args={"check_same_thread": False} if "sqlite" in settings.DATABASE_URL else {}
 )
 
-# Enable foreign keys for SQLite
 if "sqlite" in settings.DATABASE_URL:
-    @event.listens_for(engine, "connect")
-    def set_sqlite_pragma(dbapi_conn, connection_record):
-        cursor = dbapi_conn.cursor()
-        cursor.execute("PRAGMA foreign_keys=ON")
-        cursor.close()
+    configure_sqlite(engine, sqlite_pragmas())
 
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+
+def create_read_engine(url: str, pragmas: dict, pool_size: int = 20):
+    """Create a read-only engine for a SQLite database file
+    
+    Connections are opened with mode=ro and PRAGMA query_only, so they can
+    never take the write lock. Returns None for non-SQLite and in-memory
+    databases, which have no separate read path.
+    """
+    parsed = make_url(url)
+    if parsed.get_backend_name() != "sqlite" or parsed.database in (None, "", ":memory:"):
+        return None
+    
+    read_engine = create_engine(
+        f"sqlite:///file:{parsed.database}?mode=ro&uri=true",
+        connect_args={"check_same_thread": False},
+        pool_size=pool_size
+    )
+    # journal_mode needs write access; the writer's connections set it
+    read_pragmas = {name: value for name, value in pragmas.items() if name != "journal_mode"}
+    read_pragmas["query_only"] = "ON"
+    configure_sqlite(read_engine, read_pragmas)
+    return read_engine
+
+
+read_engine = None
+if settings.READ_ENGINE_ENABLED:
+    read_engine = create_read_engine(
+        settings.DATABASE_URL,
+        sqlite_pragmas() if "sqlite" in settings.DATABASE_URL else {},
+        settings.READ_POOL_SIZE
+    )
+
+ReadSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=read_engine or engine)
+
 Base = declarative_base()
 
 
+def async_database_url(url: str) -> str:
+    """Map a synchronous database URL onto its asyncio driver"""
+    drivers = {
+        "sqlite": "sqlite+aiosqlite",
+        "postgresql": "postgresql+asyncpg",
+        "mysql": "mysql+aiomysql",
+    }
+    scheme, sep, rest = url.partition("://")
+    return f"{drivers.get(scheme, scheme)}{sep}{rest}"
+
+
+# Opt-in asyncio engine for get_async_db and the hot catalog reads behind
+# get_catalog_db, queried through the Async* repositories.
+async_engine = None
+AsyncSessionLocal = None
+
+if settings.ASYNC_DATABASE_ENABLED:
+    async_engine = create_async_engine(
+        settings.ASYNC_DATABASE_URL or async_database_url(settings.DATABASE_URL)
+    )
+    if "sqlite" in settings.DATABASE_URL:
+        configure_sqlite(async_engine.sync_engine, sqlite_pragmas())
+    AsyncSessionLocal = async_sessionmaker(
+        async_engine,
+        class_=AsyncSession,
+        autoflush=False,
+        expire_on_commit=False
+    )
+
+
 def get_db():
     db = SessionLocal()
     try:
         yield db
     finally:
         db.close()
+
+
+def get_read_db():
+    """Session for read-only routes, bound to the read-only engine when there is one"""
+    db = ReadSessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+async def get_async_db():
+    if AsyncSessionLocal is None:
+        raise RuntimeError("Async database mode is disabled, set ASYNC_DATABASE_ENABLED=True")
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
+async def get_catalog_db():
+    """Session for the hot catalog reads: an AsyncSession in async mode, otherwise a read session
+    
+    Routes using it await AsyncSweetService on the former and run SweetService
+    in the threadpool on the latter.
+    """
+    if AsyncSessionLocal is None:
+        db = ReadSessionLocal()
+        try:
+            yield db
+        finally:
+            db.close()
+        return
+    
+    async with AsyncSessionLocal() as db:
+        yield db
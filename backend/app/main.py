@@ -1,12 +1,29 @@
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from app.api.v1 import auth, sweets, inventory
+from app.api.v1 import auth, sweets, inventory, sales
 from app.config import settings
+from app.database import async_engine
+from app.services.group_commit import group_commit_writer
+from app.utils.password_pool import password_hasher
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    if settings.GROUP_COMMIT_ENABLED:
+        group_commit_writer.start()
+    yield
+    group_commit_writer.stop()
+    password_hasher.shutdown()
+    if async_engine is not None:
+        await async_engine.dispose()
+
 
 app = FastAPI(
     title="Sweet Shop Management API",
     description="API for managing sweet shop inventory and purchases",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan
 )
 
 # CORS configuration
@@ -22,6 +39,7 @@ app.add_middleware(
 app.include_router(auth.router, prefix="/api/v1/auth", tags=["auth"])
 app.include_router(sweets.router, prefix="/api/v1/sweets", tags=["sweets"])
 app.include_router(inventory.router, prefix="/api/v1/inventory", tags=["inventory"])
+app.include_router(sales.router, prefix="/api/v1/sales", tags=["sales"])
 
 
 @app.get("/")
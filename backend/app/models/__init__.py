@@ -1,6 +1,7 @@
 from app.models.user import User
-from app.models.sweet import Sweet
+from app.models.sweet import Sweet, SweetTombstone, CatalogVersion
 from app.models.purchase import PurchaseHistory
 from app.models.inventory_log import InventoryLog
+from app.models.sales import DailySweetSales
 
-__all__ = ["User", "Sweet", "PurchaseHistory", "InventoryLog"]
+__all__ = ["User", "Sweet", "SweetTombstone", "CatalogVersion", "PurchaseHistory", "InventoryLog", "DailySweetSales"]
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Text
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Text, Index
 from sqlalchemy.orm import relationship
 from datetime import datetime
 from app.database import Base
@@ -6,6 +6,10 @@ from app.database import Base
 
 class InventoryLog(Base):
     __tablename__ = "inventory_logs"
+    __table_args__ = (
+        # Serves a sweet's history by time range, with keyset pagination
+        Index("ix_inventory_logs_sweet_created_id", "sweet_id", "created_at", "id"),
+    )
 
     id = Column(Integer, primary_key=True, autoincrement=True, index=True)
     sweet_id = Column(Integer, ForeignKey("sweets.id", ondelete='CASCADE'), nullable=False, index=True)
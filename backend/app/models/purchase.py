@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, DateTime, ForeignKey, Numeric
+from sqlalchemy import Column, Integer, DateTime, ForeignKey, Numeric, Index
 from sqlalchemy.orm import relationship
 from datetime import datetime
 from app.database import Base
@@ -6,6 +6,10 @@ from app.database import Base
 
 class PurchaseHistory(Base):
     __tablename__ = "purchase_history"
+    __table_args__ = (
+        # Serves a user's purchases newest first, with keyset pagination
+        Index("ix_purchase_history_user_date_id", "user_id", "purchase_date", "id"),
+    )
 
     id = Column(Integer, primary_key=True, autoincrement=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id", ondelete='CASCADE'), nullable=False, index=True)
@@ -0,0 +1,20 @@
+from sqlalchemy import Column, Integer, Date, Numeric, Index
+from app.database import Base
+
+
+class DailySweetSales(Base):
+    """Units and revenue per sweet per (UTC) day, kept in step with purchases
+    
+    Rows outlive their sweet and purchase history, so reports keep past sales.
+    """
+    __tablename__ = "daily_sweet_sales"
+    __table_args__ = (
+        # The primary key serves date ranges; this serves one sweet's series
+        Index("ix_daily_sweet_sales_sweet_date", "sweet_id", "sale_date"),
+    )
+
+    sale_date = Column(Date, primary_key=True)
+    sweet_id = Column(Integer, primary_key=True, autoincrement=False)
+    units = Column(Integer, nullable=False, default=0)
+    revenue = Column(Numeric(12, 2), nullable=False, default=0)
+    purchases = Column(Integer, nullable=False, default=0)
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, Numeric
+from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, Numeric, DDL, event
 from sqlalchemy.orm import relationship
 from datetime import datetime
 from app.database import Base
@@ -17,7 +17,112 @@ class Sweet(Base):
     created_by = Column(Integer, ForeignKey('users.id', ondelete='SET NULL'), nullable=True)
     created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
+    # Catalog change version, stamped by the triggers below on every insert/update
+    version = Column(Integer, nullable=False, server_default="0", index=True)
 
     purchases = relationship("PurchaseHistory", back_populates="sweet")
     inventory_logs = relationship("InventoryLog", back_populates="sweet")
     created_by_user = relationship("User", back_populates="created_sweets")
+
+
+class SweetTombstone(Base):
+    """Records the catalog version at which a sweet was deleted"""
+    __tablename__ = "sweet_tombstones"
+
+    sweet_id = Column(Integer, primary_key=True, autoincrement=False)
+    version = Column(Integer, nullable=False, index=True)
+
+
+class CatalogVersion(Base):
+    """Single-row counter behind sweets.version and sweet_tombstones.version"""
+    __tablename__ = "catalog_version"
+
+    id = Column(Integer, primary_key=True)
+    version = Column(Integer, nullable=False, default=0)
+
+
+# Full-text search index over name, category and description (SQLite FTS5).
+# It is an external-content table, so the triggers below keep it in sync with
+# every insert, delete and text-column update on `sweets`.
+SWEETS_FTS_DDL = [
+    """
+    CREATE VIRTUAL TABLE IF NOT EXISTS sweets_fts USING fts5(
+        name, category, description,
+        content='sweets', content_rowid='id'
+    )
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS sweets_fts_ai AFTER INSERT ON sweets BEGIN
+        INSERT INTO sweets_fts(rowid, name, category, description)
+        VALUES (new.id, new.name, new.category, new.description);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS sweets_fts_ad AFTER DELETE ON sweets BEGIN
+        INSERT INTO sweets_fts(sweets_fts, rowid, name, category, description)
+        VALUES ('delete', old.id, old.name, old.category, old.description);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS sweets_fts_au AFTER UPDATE OF name, category, description ON sweets BEGIN
+        INSERT INTO sweets_fts(sweets_fts, rowid, name, category, description)
+        VALUES ('delete', old.id, old.name, old.category, old.description);
+        INSERT INTO sweets_fts(rowid, name, category, description)
+        VALUES (new.id, new.name, new.category, new.description);
+    END
+    """,
+]
+
+for statement in SWEETS_FTS_DDL:
+    event.listen(Sweet.__table__, "after_create", DDL(statement).execute_if(dialect="sqlite"))
+
+event.listen(
+    Sweet.__table__,
+    "after_drop",
+    DDL("DROP TABLE IF EXISTS sweets_fts").execute_if(dialect="sqlite")
+)
+
+
+# Change versions for GET /sweets/changes. Every insert, update and delete on
+# `sweets` bumps the catalog counter; inserts and updates stamp the row with
+# it and deletes leave a tombstone. SQLite runs one writer at a time, so
+# versions become visible in order.
+SWEETS_VERSION_DDL = [
+    """
+    CREATE TRIGGER IF NOT EXISTS sweets_version_ai AFTER INSERT ON sweets BEGIN
+        UPDATE catalog_version SET version = version + 1 WHERE id = 1;
+        UPDATE sweets SET version = (SELECT version FROM catalog_version WHERE id = 1) WHERE id = new.id;
+        DELETE FROM sweet_tombstones WHERE sweet_id = new.id;
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS sweets_version_au AFTER UPDATE ON sweets
+    WHEN new.version = old.version BEGIN
+        UPDATE catalog_version SET version = version + 1 WHERE id = 1;
+        UPDATE sweets SET version = (SELECT version FROM catalog_version WHERE id = 1) WHERE id = new.id;
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS sweets_version_ad AFTER DELETE ON sweets BEGIN
+        UPDATE catalog_version SET version = version + 1 WHERE id = 1;
+        INSERT OR REPLACE INTO sweet_tombstones(sweet_id, version)
+        VALUES (old.id, (SELECT version FROM catalog_version WHERE id = 1));
+    END
+    """,
+]
+
+for statement in SWEETS_VERSION_DDL:
+    event.listen(Sweet.__table__, "after_create", DDL(statement).execute_if(dialect="sqlite"))
+
+event.listen(
+    CatalogVersion.__table__,
+    "after_create",
+    DDL("INSERT INTO catalog_version (id, version) VALUES (1, 0)")
+)
+
+
+def create_search_index(connection):
+    """Create the FTS index on an existing database and rebuild it from `sweets`"""
+    for statement in SWEETS_FTS_DDL:
+        connection.exec_driver_sql(statement)
+    connection.exec_driver_sql("INSERT INTO sweets_fts(sweets_fts) VALUES ('rebuild')")
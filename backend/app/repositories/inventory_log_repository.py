@@ -0,0 +1,43 @@
+from datetime import datetime
+from sqlalchemy import select, tuple_
+from sqlalchemy.orm import Session
+from typing import List, Optional, Tuple
+from app.models.inventory_log import InventoryLog
+
+
+class InventoryLogRepository:
+    def __init__(self, db: Session):
+        self.db = db
+    
+    def get_sweet_page(
+        self,
+        sweet_id: int,
+        limit: int = 100,
+        before: Optional[Tuple[datetime, int]] = None,
+        since: Optional[datetime] = None,
+        until: Optional[datetime] = None,
+        action: Optional[str] = None
+    ) -> List[tuple]:
+        """Get a sweet's inventory logs as plain rows, newest first
+        
+        `since` is inclusive and `until` exclusive. Paged by keyset on
+        (created_at, id) starting before the given position.
+        """
+        stmt = select(*InventoryLog.__table__.columns).where(InventoryLog.sweet_id == sweet_id)
+        
+        if since is not None:
+            stmt = stmt.where(InventoryLog.created_at >= since)
+        
+        if until is not None:
+            stmt = stmt.where(InventoryLog.created_at < until)
+        
+        if action:
+            stmt = stmt.where(InventoryLog.action == action.upper())
+        
+        if before is not None:
+            stmt = stmt.where(
+                tuple_(InventoryLog.created_at, InventoryLog.id) < tuple_(*before)
+            )
+        
+        stmt = stmt.order_by(InventoryLog.created_at.desc(), InventoryLog.id.desc())
+        return self.db.execute(stmt.limit(limit)).all()
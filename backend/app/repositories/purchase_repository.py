@@ -1,6 +1,31 @@
+from datetime import datetime
+from sqlalchemy import func, insert, select, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from typing import List
+from typing import List, Optional, Tuple
 from app.models.purchase import PurchaseHistory
+from app.models.sweet import Sweet
+
+
+def _user_page_statement(user_id: int, limit: int, before: Optional[Tuple[datetime, int]]):
+    stmt = select(
+        PurchaseHistory.id,
+        PurchaseHistory.user_id,
+        PurchaseHistory.sweet_id,
+        func.coalesce(Sweet.name, "N/A").label("sweet_name"),
+        PurchaseHistory.quantity,
+        PurchaseHistory.total_price,
+        PurchaseHistory.purchase_date
+    ).outerjoin(Sweet, Sweet.id == PurchaseHistory.sweet_id)\
+        .where(PurchaseHistory.user_id == user_id)
+    
+    if before is not None:
+        stmt = stmt.where(
+            tuple_(PurchaseHistory.purchase_date, PurchaseHistory.id) < tuple_(*before)
+        )
+    
+    stmt = stmt.order_by(PurchaseHistory.purchase_date.desc(), PurchaseHistory.id.desc())
+    return stmt.limit(limit)
 
 
 class PurchaseRepository:
@@ -12,9 +37,10 @@ class PurchaseRepository:
         user_id: int,
         sweet_id: int,
         quantity: int,
-        total_price: float
+        total_price: float,
+        commit: bool = True
     ) -> PurchaseHistory:
-        """Create a new purchase"""
+        """Create a new purchase, or just add it to the session if commit is False"""
         purchase = PurchaseHistory(
             user_id=user_id,
             sweet_id=sweet_id,
@@ -22,10 +48,21 @@ class PurchaseRepository:
             total_price=total_price
         )
         self.db.add(purchase)
-        self.db.commit()
-        self.db.refresh(purchase)
+        if commit:
+            self.db.commit()
+            self.db.refresh(purchase)
         return purchase
     
+    def create_many(self, rows: List[dict], commit: bool = True) -> List[PurchaseHistory]:
+        """Bulk insert purchases from dicts of column values"""
+        purchases = self.db.scalars(
+            insert(PurchaseHistory).returning(PurchaseHistory),
+            rows
+        ).all()
+        if commit:
+            self.db.commit()
+        return purchases
+    
     def get_by_id(self, purchase_id: int) -> PurchaseHistory:
         """Get purchase by ID"""
         return self.db.query(PurchaseHistory).filter(PurchaseHistory.id == purchase_id).first()
@@ -38,8 +75,86 @@ class PurchaseRepository:
         """Get all purchases for a sweet"""
         return self.db.query(PurchaseHistory).filter(PurchaseHistory.sweet_id == sweet_id).all()
     
+    def get_user_page(
+        self,
+        user_id: int,
+        limit: int = 100,
+        before: Optional[Tuple[datetime, int]] = None
+    ) -> List[tuple]:
+        """Get a user's purchases with sweet names, newest first
+        
+        One joined query selecting only the listed columns, paged by keyset on
+        (purchase_date, id) starting before the given position.
+        """
+        return self.db.execute(_user_page_statement(user_id, limit, before)).all()
+    
     def delete(self, purchase: PurchaseHistory) -> bool:
         """Delete purchase"""
         self.db.delete(purchase)
         self.db.commit()
         return True
+
+
+class AsyncPurchaseRepository:
+    """asyncio counterpart of PurchaseRepository"""
+    
+    def __init__(self, db: AsyncSession):
+        self.db = db
+    
+    async def create(
+        self,
+        user_id: int,
+        sweet_id: int,
+        quantity: int,
+        total_price: float,
+        commit: bool = True
+    ) -> PurchaseHistory:
+        """Create a new purchase, or just add it to the session if commit is False"""
+        purchase = PurchaseHistory(
+            user_id=user_id,
+            sweet_id=sweet_id,
+            quantity=quantity,
+            total_price=total_price
+        )
+        self.db.add(purchase)
+        if commit:
+            await self.db.commit()
+            await self.db.refresh(purchase)
+        return purchase
+    
+    async def create_many(self, rows: List[dict], commit: bool = True) -> List[PurchaseHistory]:
+        """Bulk insert purchases from dicts of column values"""
+        purchases = (await self.db.scalars(
+            insert(PurchaseHistory).returning(PurchaseHistory),
+            rows
+        )).all()
+        if commit:
+            await self.db.commit()
+        return purchases
+    
+    async def get_by_id(self, purchase_id: int) -> PurchaseHistory:
+        """Get purchase by ID"""
+        return await self.db.scalar(select(PurchaseHistory).where(PurchaseHistory.id == purchase_id))
+    
+    async def get_by_user(self, user_id: int) -> List[PurchaseHistory]:
+        """Get all purchases by user"""
+        return (await self.db.scalars(select(PurchaseHistory).where(PurchaseHistory.user_id == user_id))).all()
+    
+    async def get_by_sweet(self, sweet_id: int) -> List[PurchaseHistory]:
+        """Get all purchases for a sweet"""
+        return (await self.db.scalars(select(PurchaseHistory).where(PurchaseHistory.sweet_id == sweet_id))).all()
+    
+    async def get_user_page(
+        self,
+        user_id: int,
+        limit: int = 100,
+        before: Optional[Tuple[datetime, int]] = None
+    ) -> List[tuple]:
+        """Get a user's purchases with sweet names, newest first, by keyset on (purchase_date, id)"""
+        return (await self.db.execute(_user_page_statement(user_id, limit, before))).all()
+    
+    async def delete(self, purchase: PurchaseHistory) -> bool:
+        """Delete purchase"""
+        await self.db.delete(purchase)
+        await self.db.commit()
+        return True
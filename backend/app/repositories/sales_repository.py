@@ -0,0 +1,76 @@
+from datetime import date
+from sqlalchemy import Float, func, select
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+from typing import List, Optional
+from app.models.sales import DailySweetSales
+from app.models.sweet import Sweet
+
+
+def _total(column):
+    return func.coalesce(func.sum(column), 0)
+
+
+class SalesRepository:
+    def __init__(self, db: Session):
+        self.db = db
+    
+    def record(self, rows: List[dict]) -> None:
+        """Add {sale_date, sweet_id, units, revenue, purchases} rows onto the rollup, without committing"""
+        dialect = self.db.get_bind().dialect.name
+        if dialect == "postgresql":
+            stmt = postgresql.insert(DailySweetSales)
+        elif dialect == "sqlite":
+            stmt = sqlite.insert(DailySweetSales)
+        else:
+            raise ValueError(f"Sales rollups are not supported on {dialect}")
+        
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[DailySweetSales.sale_date, DailySweetSales.sweet_id],
+            set_={
+                "units": DailySweetSales.units + stmt.excluded.units,
+                "revenue": DailySweetSales.revenue + stmt.excluded.revenue,
+                "purchases": DailySweetSales.purchases + stmt.excluded.purchases,
+            }
+        )
+        self.db.execute(stmt, rows)
+    
+    def get_summary(self, start: date, end: date):
+        """Total units, revenue and purchases between two dates, inclusive"""
+        return self.db.execute(
+            select(
+                _total(DailySweetSales.units).label("units"),
+                _total(DailySweetSales.revenue).cast(Float).label("revenue"),
+                _total(DailySweetSales.purchases).label("purchases")
+            ).where(DailySweetSales.sale_date.between(start, end))
+        ).one()
+    
+    def get_daily(self, start: date, end: date, sweet_id: Optional[int] = None) -> List[tuple]:
+        """Units, revenue and purchases per day between two dates, inclusive"""
+        stmt = select(
+            DailySweetSales.sale_date,
+            _total(DailySweetSales.units).label("units"),
+            _total(DailySweetSales.revenue).cast(Float).label("revenue"),
+            _total(DailySweetSales.purchases).label("purchases")
+        ).where(DailySweetSales.sale_date.between(start, end))
+        
+        if sweet_id is not None:
+            stmt = stmt.where(DailySweetSales.sweet_id == sweet_id)
+        
+        stmt = stmt.group_by(DailySweetSales.sale_date).order_by(DailySweetSales.sale_date)
+        return self.db.execute(stmt).all()
+    
+    def get_by_sweet(self, start: date, end: date, limit: int = 100) -> List[tuple]:
+        """Units, revenue and purchases per sweet between two dates, highest revenue first"""
+        revenue = _total(DailySweetSales.revenue).cast(Float).label("revenue")
+        stmt = select(
+            DailySweetSales.sweet_id,
+            func.coalesce(func.max(Sweet.name), "N/A").label("sweet_name"),
+            _total(DailySweetSales.units).label("units"),
+            revenue,
+            _total(DailySweetSales.purchases).label("purchases")
+        ).outerjoin(Sweet, Sweet.id == DailySweetSales.sweet_id)\
+            .where(DailySweetSales.sale_date.between(start, end))\
+            .group_by(DailySweetSales.sweet_id)\
+            .order_by(revenue.desc(), DailySweetSales.sweet_id)
+        return self.db.execute(stmt.limit(limit)).all()
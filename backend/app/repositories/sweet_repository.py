@@ -1,6 +1,190 @@
+import re
+from sqlalchemy import Float, Row, bindparam, column, delete, func, or_, select, table, tuple_, type_coerce, update
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from typing import List, Optional
-from app.models.sweet import Sweet
+from typing import Any, Dict, List, Optional, Tuple
+from app.models.sweet import Sweet, SweetTombstone, CatalogVersion
+from app.models.inventory_log import InventoryLog
+from app.models.purchase import PurchaseHistory
+
+# Stable keyset orderings; `id` breaks ties so every position is unique
+SORT_KEYS = {
+    "id": Sweet.id,
+    "category": Sweet.category,
+    "price": Sweet.price,
+}
+
+# Plain column selects for read paths that serialize rows straight to JSON,
+# keyed by response field, in the field order of the Sweet response schema.
+# Price comes back as a float rather than a Decimal, as the schema would
+# render it.
+SWEET_FIELDS = {
+    "id": Sweet.id,
+    "name": Sweet.name,
+    "description": Sweet.description,
+    "price": type_coerce(Sweet.price, Float).label("price"),
+    "quantity": Sweet.quantity,
+    "category": Sweet.category,
+    "image_url": Sweet.image_url,
+    "created_at": Sweet.created_at,
+    "updated_at": Sweet.updated_at,
+}
+SWEET_COLUMNS = list(SWEET_FIELDS.values())
+
+sweets_fts = table("sweets_fts", column("rowid"), column("sweets_fts"), column("rank"))
+
+
+def _all_statement(skip: int, limit: int, category: Optional[str], columns: Optional[list] = None):
+    stmt = select(*columns) if columns else select(Sweet)
+    
+    if category:
+        stmt = stmt.where(Sweet.category == category)
+    
+    return stmt.offset(skip).limit(limit)
+
+
+def _page_statement(
+    limit: int,
+    category: Optional[str],
+    order_by: str,
+    after: Optional[Tuple[Any, int]],
+    columns: Optional[list] = None
+):
+    key = SORT_KEYS[order_by]
+    stmt = select(*columns) if columns else select(Sweet)
+    
+    if category:
+        stmt = stmt.where(Sweet.category == category)
+    
+    if after is not None:
+        value, last_id = after
+        if key is Sweet.id:
+            stmt = stmt.where(Sweet.id > last_id)
+        else:
+            stmt = stmt.where(tuple_(key, Sweet.id) > tuple_(value, last_id))
+    
+    if key is Sweet.id:
+        stmt = stmt.order_by(Sweet.id)
+    else:
+        stmt = stmt.order_by(key, Sweet.id)
+    
+    return stmt.limit(limit)
+
+
+def _search_statement(
+    dialect: str,
+    q: str,
+    skip: int,
+    limit: int,
+    category: Optional[str],
+    min_price: Optional[float],
+    max_price: Optional[float],
+    columns: Optional[list] = None
+):
+    terms = re.findall(r"\w+", q or "")
+    stmt = select(*columns) if columns else select(Sweet)
+    
+    if terms and dialect == "sqlite":
+        # Quote every term and match it as a prefix so user input can never
+        # be parsed as FTS5 query syntax.
+        match = " ".join(f'"{term}"*' for term in terms)
+        stmt = stmt.join(sweets_fts, sweets_fts.c.rowid == Sweet.id)\
+            .where(sweets_fts.c.sweets_fts.op("MATCH")(match))\
+            .order_by(sweets_fts.c.rank)
+    else:
+        for term in terms:
+            pattern = f"%{term}%"
+            stmt = stmt.where(or_(
+                Sweet.name.ilike(pattern),
+                Sweet.category.ilike(pattern),
+                Sweet.description.ilike(pattern)
+            ))
+    
+    if category:
+        stmt = stmt.where(Sweet.category == category)
+    
+    if min_price is not None:
+        stmt = stmt.where(Sweet.price >= min_price)
+    
+    if max_price is not None:
+        stmt = stmt.where(Sweet.price <= max_price)
+    
+    return stmt.offset(skip).limit(limit)
+
+
+def _decrement_stock_statement(sweet_id: int, quantity: int):
+    return update(Sweet)\
+        .where(Sweet.id == sweet_id, Sweet.quantity >= quantity)\
+        .values(quantity=Sweet.quantity - quantity)\
+        .returning(Sweet.price, Sweet.quantity)\
+        .execution_options(synchronize_session=False)
+
+
+def _increment_stock_statement(sweet_id: int, quantity: int):
+    return update(Sweet)\
+        .where(Sweet.id == sweet_id)\
+        .values(quantity=Sweet.quantity + quantity)\
+        .returning(Sweet.quantity)\
+        .execution_options(synchronize_session=False)
+
+
+def _update_where_statement(
+    values: dict,
+    price_multiplier: Optional[float],
+    ids: Optional[List[int]],
+    category: Optional[str],
+    min_price: Optional[float],
+    max_price: Optional[float]
+):
+    values = dict(values)
+    if price_multiplier is not None:
+        values["price"] = func.round(Sweet.price * price_multiplier, 2)
+    
+    stmt = update(Sweet).values(**values)
+    
+    # An empty id list matches nothing rather than dropping the filter
+    if ids is not None:
+        stmt = stmt.where(Sweet.id.in_(ids))
+    
+    if category is not None:
+        stmt = stmt.where(Sweet.category == category)
+    
+    if min_price is not None:
+        stmt = stmt.where(Sweet.price >= min_price)
+    
+    if max_price is not None:
+        stmt = stmt.where(Sweet.price <= max_price)
+    
+    return stmt.execution_options(synchronize_session=False)
+
+
+_catalog_version = select(CatalogVersion.version).where(CatalogVersion.id == 1)
+
+
+def _changes_statements(since: int, until: int, limit: int, columns: list):
+    rows = select(*columns, Sweet.version)\
+        .where(Sweet.version > since, Sweet.version <= until)\
+        .order_by(Sweet.version)\
+        .limit(limit)
+    tombstones = select(SweetTombstone.sweet_id, SweetTombstone.version)\
+        .where(SweetTombstone.version > since, SweetTombstone.version <= until)\
+        .order_by(SweetTombstone.version)\
+        .limit(limit)
+    return rows, tombstones
+
+
+def _existing_ids_statement(ids):
+    return select(Sweet.id).where(Sweet.id.in_(ids))
+
+
+def _quantities_statement(sweet_ids: List[int]):
+    return select(Sweet.id, Sweet.quantity).where(Sweet.id.in_(set(sweet_ids)))
+
+
+# Core executemany form of _increment_stock_statement, fed {"b_id", "b_quantity"} rows
+_increment_stock_many_statement = update(Sweet.__table__)\
+    .where(Sweet.__table__.c.id == bindparam("b_id"))\
+    .values(quantity=Sweet.__table__.c.quantity + bindparam("b_quantity"))
 
 
 class SweetRepository:
@@ -34,19 +218,56 @@ class SweetRepository:
         """Get sweet by ID"""
         return self.db.query(Sweet).filter(Sweet.id == sweet_id).first()
     
+    def get_row(self, sweet_id: int, columns: list):
+        """Get the given columns of one sweet as a row tuple"""
+        return self.db.execute(select(*columns).where(Sweet.id == sweet_id)).first()
+    
+    def get_catalog_version(self) -> int:
+        """Latest catalog change version, bumped by every insert, update and delete"""
+        return self.db.scalar(_catalog_version) or 0
+    
+    def get_changes(self, since: int, until: int, limit: int, columns: list) -> Tuple[list, list]:
+        """Sweets (as row tuples with `version`) and tombstones changed in (since, until], oldest first"""
+        rows, tombstones = _changes_statements(since, until, limit, columns)
+        return self.db.execute(rows).all(), self.db.execute(tombstones).all()
+    
     def get_all(
         self,
         skip: int = 0,
         limit: int = 100,
-        category: Optional[str] = None
+        category: Optional[str] = None,
+        columns: Optional[list] = None
     ) -> List[Sweet]:
         """Get all sweets with optional category filter"""
-        query = self.db.query(Sweet)
-        
-        if category:
-            query = query.filter(Sweet.category == category)
-        
-        return query.offset(skip).limit(limit).all()
+        return self._fetch(_all_statement(skip, limit, category, columns), columns)
+    
+    def get_page(
+        self,
+        limit: int = 100,
+        category: Optional[str] = None,
+        order_by: str = "id",
+        after: Optional[Tuple[Any, int]] = None,
+        columns: Optional[list] = None
+    ) -> List[Sweet]:
+        """Get sweets ordered by (order_by, id), starting after a keyset position"""
+        return self._fetch(_page_statement(limit, category, order_by, after, columns), columns)
+    
+    def search(
+        self,
+        q: str,
+        skip: int = 0,
+        limit: int = 100,
+        category: Optional[str] = None,
+        min_price: Optional[float] = None,
+        max_price: Optional[float] = None,
+        columns: Optional[list] = None
+    ) -> List[Sweet]:
+        """Full-text search sweets, combined with category and price filters"""
+        stmt = _search_statement(
+            self.db.get_bind().dialect.name,
+            q, skip, limit, category, min_price, max_price, columns
+        )
+        return self._fetch(stmt, columns)
     
     def update(self, sweet: Sweet, data: dict) -> Sweet:
         """Update sweet"""
@@ -57,11 +278,71 @@ class SweetRepository:
         self.db.refresh(sweet)
         return sweet
     
+    def update_many(self, rows: List[Dict[str, Any]], commit: bool = True) -> List[int]:
+        """Apply partial updates keyed by id; returns the ids that do not exist"""
+        ids = {row["id"] for row in rows}
+        existing = set(self.db.scalars(_existing_ids_statement(ids)))
+        rows = [row for row in rows if row["id"] in existing]
+        
+        if rows:
+            # ORM bulk UPDATE by primary key: one executemany per distinct key set
+            self.db.execute(update(Sweet), rows)
+        if commit:
+            self.db.commit()
+        return sorted(ids - existing)
+    
+    def update_where(
+        self,
+        values: dict,
+        price_multiplier: Optional[float] = None,
+        ids: Optional[List[int]] = None,
+        category: Optional[str] = None,
+        min_price: Optional[float] = None,
+        max_price: Optional[float] = None,
+        commit: bool = True
+    ) -> int:
+        """Apply one patch to every sweet matching the filter; returns the row count"""
+        result = self.db.execute(_update_where_statement(
+            values, price_multiplier, ids, category, min_price, max_price
+        ))
+        if commit:
+            self.db.commit()
+        return result.rowcount
+    
+    def decrement_stock(self, sweet_id: int, quantity: int) -> Optional[Row]:
+        """Atomically take `quantity` units out of stock without committing
+        
+        Returns the unit price and remaining quantity, or None when the sweet
+        does not exist or has fewer than `quantity` units left.
+        """
+        return self.db.execute(_decrement_stock_statement(sweet_id, quantity)).one_or_none()
+    
+    def increment_stock(self, sweet_id: int, quantity: int) -> Optional[int]:
+        """Atomically add `quantity` units to stock without committing
+        
+        Returns the new quantity, or None when the sweet does not exist.
+        """
+        return self.db.execute(_increment_stock_statement(sweet_id, quantity)).scalar_one_or_none()
+    
+    def increment_stock_many(self, rows: List[Tuple[int, int]]) -> None:
+        """Add stock for many (sweet_id, quantity) pairs in one batched statement, without committing"""
+        self.db.execute(
+            _increment_stock_many_statement,
+            [{"b_id": sweet_id, "b_quantity": quantity} for sweet_id, quantity in rows]
+        )
+    
+    def get_quantities(self, sweet_ids: List[int]) -> Dict[int, int]:
+        """Map each existing sweet id to its current stock"""
+        return dict(self.db.execute(_quantities_statement(sweet_ids)).all())
+    
+    def _fetch(self, stmt, columns: Optional[list]) -> list:
+        """Sweet objects, or plain row tuples when specific columns were selected"""
+        if columns:
+            return self.db.execute(stmt).all()
+        return self.db.scalars(stmt).all()
+    
     def delete(self, sweet: Sweet) -> bool:
         """Delete sweet - cascade delete inventory logs and purchases"""
-        from app.models.inventory_log import InventoryLog
-        from app.models.purchase import PurchaseHistory
-        
         # Delete related inventory logs first
         self.db.query(InventoryLog).filter(InventoryLog.sweet_id == sweet.id).delete()
         
@@ -72,3 +353,160 @@ class SweetRepository:
         self.db.delete(sweet)
         self.db.commit()
         return True
+
+
+class AsyncSweetRepository:
+    """asyncio counterpart of SweetRepository"""
+    
+    def __init__(self, db: AsyncSession):
+        self.db = db
+    
+    async def create(
+        self,
+        name: str,
+        price: float,
+        description: Optional[str] = None,
+        quantity: int = 0,
+        category: Optional[str] = None,
+        image_url: Optional[str] = None
+    ) -> Sweet:
+        """Create a new sweet"""
+        sweet = Sweet(
+            name=name,
+            price=price,
+            description=description,
+            quantity=quantity,
+            category=category,
+            image_url=image_url
+        )
+        self.db.add(sweet)
+        await self.db.commit()
+        await self.db.refresh(sweet)
+        return sweet
+    
+    async def get_by_id(self, sweet_id: int) -> Sweet:
+        """Get sweet by ID"""
+        return await self.db.scalar(select(Sweet).where(Sweet.id == sweet_id))
+    
+    async def get_row(self, sweet_id: int, columns: list):
+        """Get the given columns of one sweet as a row tuple"""
+        return (await self.db.execute(select(*columns).where(Sweet.id == sweet_id))).first()
+    
+    async def get_catalog_version(self) -> int:
+        """Latest catalog change version"""
+        return await self.db.scalar(_catalog_version) or 0
+    
+    async def get_changes(self, since: int, until: int, limit: int, columns: list) -> Tuple[list, list]:
+        """Sweets (as row tuples with `version`) and tombstones changed in (since, until], oldest first"""
+        rows, tombstones = _changes_statements(since, until, limit, columns)
+        return (await self.db.execute(rows)).all(), (await self.db.execute(tombstones)).all()
+    
+    async def get_all(
+        self,
+        skip: int = 0,
+        limit: int = 100,
+        category: Optional[str] = None,
+        columns: Optional[list] = None
+    ) -> List[Sweet]:
+        """Get all sweets with optional category filter"""
+        return await self._fetch(_all_statement(skip, limit, category, columns), columns)
+    
+    async def get_page(
+        self,
+        limit: int = 100,
+        category: Optional[str] = None,
+        order_by: str = "id",
+        after: Optional[Tuple[Any, int]] = None,
+        columns: Optional[list] = None
+    ) -> List[Sweet]:
+        """Get sweets ordered by (order_by, id), starting after a keyset position"""
+        return await self._fetch(_page_statement(limit, category, order_by, after, columns), columns)
+    
+    async def search(
+        self,
+        q: str,
+        skip: int = 0,
+        limit: int = 100,
+        category: Optional[str] = None,
+        min_price: Optional[float] = None,
+        max_price: Optional[float] = None,
+        columns: Optional[list] = None
+    ) -> List[Sweet]:
+        """Full-text search sweets, combined with category and price filters"""
+        stmt = _search_statement(
+            self.db.get_bind().dialect.name,
+            q, skip, limit, category, min_price, max_price, columns
+        )
+        return await self._fetch(stmt, columns)
+    
+    async def update(self, sweet: Sweet, data: dict) -> Sweet:
+        """Update sweet"""
+        for key, value in data.items():
+            if value is not None:
+                setattr(sweet, key, value)
+        await self.db.commit()
+        await self.db.refresh(sweet)
+        return sweet
+    
+    async def update_many(self, rows: List[Dict[str, Any]], commit: bool = True) -> List[int]:
+        """Apply partial updates keyed by id; returns the ids that do not exist"""
+        ids = {row["id"] for row in rows}
+        existing = set(await self.db.scalars(_existing_ids_statement(ids)))
+        rows = [row for row in rows if row["id"] in existing]
+        
+        if rows:
+            await self.db.execute(update(Sweet), rows)
+        if commit:
+            await self.db.commit()
+        return sorted(ids - existing)
+    
+    async def update_where(
+        self,
+        values: dict,
+        price_multiplier: Optional[float] = None,
+        ids: Optional[List[int]] = None,
+        category: Optional[str] = None,
+        min_price: Optional[float] = None,
+        max_price: Optional[float] = None,
+        commit: bool = True
+    ) -> int:
+        """Apply one patch to every sweet matching the filter; returns the row count"""
+        result = await self.db.execute(_update_where_statement(
+            values, price_multiplier, ids, category, min_price, max_price
+        ))
+        if commit:
+            await self.db.commit()
+        return result.rowcount
+    
+    async def decrement_stock(self, sweet_id: int, quantity: int) -> Optional[Row]:
+        """Atomically take `quantity` units out of stock without committing"""
+        return (await self.db.execute(_decrement_stock_statement(sweet_id, quantity))).one_or_none()
+    
+    async def increment_stock(self, sweet_id: int, quantity: int) -> Optional[int]:
+        """Atomically add `quantity` units to stock without committing"""
+        return (await self.db.execute(_increment_stock_statement(sweet_id, quantity))).scalar_one_or_none()
+    
+    async def increment_stock_many(self, rows: List[Tuple[int, int]]) -> None:
+        """Add stock for many (sweet_id, quantity) pairs in one batched statement, without committing"""
+        await self.db.execute(
+            _increment_stock_many_statement,
+            [{"b_id": sweet_id, "b_quantity": quantity} for sweet_id, quantity in rows]
+        )
+    
+    async def get_quantities(self, sweet_ids: List[int]) -> Dict[int, int]:
+        """Map each existing sweet id to its current stock"""
+        return dict((await self.db.execute(_quantities_statement(sweet_ids))).all())
+    
+    async def _fetch(self, stmt, columns: Optional[list]) -> list:
+        """Sweet objects, or plain row tuples when specific columns were selected"""
+        if columns:
+            return (await self.db.execute(stmt)).all()
+        return (await self.db.scalars(stmt)).all()
+    
+    async def delete(self, sweet: Sweet) -> bool:
+        """Delete sweet - cascade delete inventory logs and purchases"""
+        await self.db.execute(delete(InventoryLog).where(InventoryLog.sweet_id == sweet.id))
+        await self.db.execute(delete(PurchaseHistory).where(PurchaseHistory.sweet_id == sweet.id))
+        await self.db.delete(sweet)
+        await self.db.commit()
+        return True
@@ -1,5 +1,17 @@
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
+from app.config import settings
 from app.models.user import User
+from app.utils.cache import TTLCache
+
+# Authenticated principals by username, read by the auth dependency.
+# update() and delete() clear it, which also bumps its generation so a
+# lookup that overlapped the write is not cached.
+principal_cache = TTLCache(
+    maxsize=settings.PRINCIPAL_CACHE_SIZE,
+    ttl=settings.PRINCIPAL_CACHE_TTL_SECONDS
+)
 
 
 class UserRepository:
@@ -35,6 +47,7 @@ class UserRepository:
         for key, value in data.items():
             setattr(user, key, value)
         self.db.commit()
+        principal_cache.clear()
         self.db.refresh(user)
         return user
     
@@ -42,4 +55,52 @@ class UserRepository:
         """Delete user"""
         self.db.delete(user)
         self.db.commit()
+        principal_cache.clear()
+        return True
+
+
+class AsyncUserRepository:
+    """asyncio counterpart of UserRepository"""
+    
+    def __init__(self, db: AsyncSession):
+        self.db = db
+    
+    async def create(self, username: str, email: str, hashed_password: str) -> User:
+        """Create a new user"""
+        user = User(
+            username=username,
+            email=email,
+            hashed_password=hashed_password
+        )
+        self.db.add(user)
+        await self.db.commit()
+        await self.db.refresh(user)
+        return user
+    
+    async def get_by_id(self, user_id: int) -> User:
+        """Get user by ID"""
+        return await self.db.scalar(select(User).where(User.id == user_id))
+    
+    async def get_by_username(self, username: str) -> User:
+        """Get user by username"""
+        return await self.db.scalar(select(User).where(User.username == username))
+    
+    async def get_by_email(self, email: str) -> User:
+        """Get user by email"""
+        return await self.db.scalar(select(User).where(User.email == email))
+    
+    async def update(self, user: User, data: dict) -> User:
+        """Update user"""
+        for key, value in data.items():
+            setattr(user, key, value)
+        await self.db.commit()
+        principal_cache.clear()
+        await self.db.refresh(user)
+        return user
+    
+    async def delete(self, user: User) -> bool:
+        """Delete user"""
+        await self.db.delete(user)
+        await self.db.commit()
+        principal_cache.clear()
         return True
@@ -1,4 +1,4 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict
 from typing import Optional
 
 
@@ -11,3 +11,13 @@ class Token(BaseModel):
 
 class TokenData(BaseModel):
     username: Optional[str] = None
+
+
+class Principal(BaseModel):
+    """Slim, immutable view of the authenticated user"""
+    model_config = ConfigDict(from_attributes=True, frozen=True)
+    
+    id: int
+    username: str
+    is_admin: bool
+    is_active: bool
@@ -1,4 +1,5 @@
 from pydantic import BaseModel
+from typing import List
 from datetime import datetime
 
 
@@ -11,6 +12,10 @@ class PurchaseHistoryCreate(PurchaseHistoryBase):
     pass
 
 
+class CheckoutRequest(BaseModel):
+    items: List[PurchaseHistoryCreate]
+
+
 class PurchaseHistory(PurchaseHistoryBase):
     id: int
     user_id: int
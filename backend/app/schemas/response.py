@@ -16,6 +16,7 @@ class PaginatedResponse(BaseModel, Generic[T]):
     success: bool
     message: str
     data: list[T]
-    total: int
-    page: int
+    total: Optional[int] = None
+    page: Optional[int] = None
     per_page: int
+    next_cursor: Optional[str] = None
@@ -1,5 +1,5 @@
 from pydantic import BaseModel
-from typing import Optional
+from typing import List, Optional
 from datetime import datetime
 
 
@@ -25,6 +25,35 @@ class SweetUpdate(BaseModel):
     image_url: Optional[str] = None
 
 
+class SweetBulkUpdateItem(SweetUpdate):
+    id: int
+
+
+class SweetBulkFilter(BaseModel):
+    ids: Optional[List[int]] = None
+    category: Optional[str] = None
+    min_price: Optional[float] = None
+    max_price: Optional[float] = None
+
+
+class SweetBulkPatch(SweetUpdate):
+    """Fields to set on every match; price_multiplier scales the current price"""
+    price_multiplier: Optional[float] = None
+
+
+class SweetBulkUpdate(BaseModel):
+    """Either `items` (partial updates keyed by id) or `filter` plus `patch`"""
+    items: Optional[List[SweetBulkUpdateItem]] = None
+    filter: Optional[SweetBulkFilter] = None
+    patch: Optional[SweetBulkPatch] = None
+
+
+class SweetImportRow(SweetBase):
+    """One catalog import line; rows with an id (or a known name) update that sweet"""
+    id: Optional[int] = None
+    category: str
+
+
 class Sweet(SweetBase):
     id: int
     created_at: datetime
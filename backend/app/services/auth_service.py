@@ -1,58 +1,70 @@
 from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
 from app.schemas.user import UserCreate
 from app.schemas.auth import Token
-from app.utils.security import hash_password, verify_password, create_access_token
+from app.models.user import User
+from app.utils.security import create_access_token
+from app.utils.password_pool import password_hasher
 from app.repositories.user_repository import UserRepository
 
 
 class AuthService:
+    """Registration and login
+    
+    Database work runs on the thread pool and the session is closed before
+    password hashing is awaited, so queued logins hold no thread or
+    connection.
+    """
+    
     def __init__(self, db: Session):
         self.db = db
         self.user_repo = UserRepository(db)
     
-    def register(self, user_create: UserCreate) -> Token:
+    async def register(self, user_create: UserCreate) -> Token:
         """Register a new user"""
-        # Check if user already exists
-        if self.user_repo.get_by_username(user_create.username):
-            raise ValueError("Username already exists")
-        
-        if self.user_repo.get_by_email(user_create.email):
-            raise ValueError("Email already exists")
+        await run_in_threadpool(self._check_available, user_create)
         
         # Hash password and create user
-        hashed_password = hash_password(user_create.password)
-        user = self.user_repo.create(
+        hashed_password = await password_hasher.hash_password(user_create.password)
+        user = await run_in_threadpool(
+            self.user_repo.create,
             username=user_create.username,
             email=user_create.email,
             hashed_password=hashed_password
         )
         
-        # Create token
-        access_token = create_access_token(data={"sub": user.username})
-        
-        user_dict = {
-            "id": user.id,
-            "username": user.username,
-            "email": user.email,
-            "is_admin": user.is_admin,
-            "is_active": user.is_active,
-            "created_at": user.created_at.isoformat() if user.created_at else None
-        }
-        
-        return Token(
-            access_token=access_token,
-            token_type="bearer",
-            user=user_dict,
-            user_id=user.id
-        )
+        return self._token(user)
     
-    def login(self, username: str, password: str) -> Token:
+    async def login(self, username: str, password: str) -> Token:
         """Login user"""
-        user = self.user_repo.get_by_username(username)
+        user = await run_in_threadpool(self._find_user, username)
         
-        if not user or not verify_password(password, user.hashed_password):
+        if not user or not await password_hasher.verify_password(password, user.hashed_password):
             return None
         
+        return self._token(user)
+    
+    def _check_available(self, user_create: UserCreate) -> None:
+        """Raise ValueError if the username or email is taken, then release the connection"""
+        try:
+            if self.user_repo.get_by_username(user_create.username):
+                raise ValueError("Username already exists")
+            
+            if self.user_repo.get_by_email(user_create.email):
+                raise ValueError("Email already exists")
+        finally:
+            self.db.close()
+    
+    def _find_user(self, username: str) -> User:
+        """Look up a user, then release the connection; the user stays readable detached"""
+        try:
+            return self.user_repo.get_by_username(username)
+        finally:
+            self.db.close()
+    
+    @staticmethod
+    def _token(user: User) -> Token:
+        """Issue an access token for a user"""
         access_token = create_access_token(data={"sub": user.username})
         
         user_dict = {
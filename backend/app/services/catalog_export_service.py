@@ -0,0 +1,62 @@
+import csv
+import io
+from typing import Iterator
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+from app.models.sweet import Sweet
+from app.services.catalog_import_service import IMPORT_COLUMNS
+from app.utils.serialization import dumps
+
+# Exports round-trip through the importer, which ignores the timestamps
+EXPORT_COLUMNS = ["id"] + IMPORT_COLUMNS + ["created_at", "updated_at"]
+
+
+class CatalogExportService:
+    """Streams the whole catalog in constant memory
+    
+    Rows are read with a server-side cursor (yield_per) as plain column tuples,
+    so no ORM objects or pydantic models are built, and are encoded a chunk at
+    a time.
+    """
+    
+    def __init__(self, db: Session, batch_size: int = 1000):
+        self.db = db
+        self.batch_size = batch_size
+    
+    def iter_rows(self) -> Iterator[dict]:
+        """Yield every sweet as a dict of JSON-friendly values, ordered by id"""
+        stmt = select(*(getattr(Sweet, column) for column in EXPORT_COLUMNS))\
+            .order_by(Sweet.id)\
+            .execution_options(yield_per=self.batch_size)
+        
+        for row in self.db.execute(stmt):
+            values = row._asdict()
+            values["price"] = float(values["price"])
+            values["created_at"] = values["created_at"].isoformat()
+            values["updated_at"] = values["updated_at"].isoformat()
+            yield values
+    
+    def iter_ndjson(self) -> Iterator[bytes]:
+        """Yield the catalog as newline-delimited JSON chunks"""
+        chunk = []
+        for values in self.iter_rows():
+            chunk.append(dumps(values))
+            if len(chunk) >= self.batch_size:
+                yield b"\n".join(chunk) + b"\n"
+                chunk = []
+        if chunk:
+            yield b"\n".join(chunk) + b"\n"
+    
+    def iter_csv(self) -> Iterator[str]:
+        """Yield the catalog as CSV chunks, header first"""
+        buffer = io.StringIO()
+        writer = csv.DictWriter(buffer, fieldnames=EXPORT_COLUMNS)
+        writer.writeheader()
+        
+        for count, values in enumerate(self.iter_rows(), start=1):
+            writer.writerow(values)
+            if count % self.batch_size == 0:
+                yield buffer.getvalue()
+                buffer.seek(0)
+                buffer.truncate()
+        yield buffer.getvalue()
@@ -0,0 +1,165 @@
+import csv
+import json
+from datetime import datetime
+from itertools import islice
+from typing import Iterable, Iterator, List, Tuple
+from pydantic import ValidationError
+from sqlalchemy import insert, select
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+from app.models.sweet import Sweet
+from app.schemas.sweet import SweetImportRow
+from app.services.sweet_service import catalog_cache
+
+IMPORT_COLUMNS = ["name", "category", "price", "quantity", "description", "image_url"]
+MAX_REPORTED_ERRORS = 1000
+
+
+def iter_csv_rows(lines: Iterable[str]) -> Iterator[Tuple[int, dict]]:
+    """Parse CSV with a header row into (line number, raw row) pairs"""
+    reader = csv.DictReader(lines)
+    for row in reader:
+        yield reader.line_num, {key: value for key, value in row.items() if value not in (None, "")}
+
+
+def iter_ndjson_rows(lines: Iterable[str]) -> Iterator[Tuple[int, dict]]:
+    """Parse newline-delimited JSON into (line number, raw row) pairs; blank lines are skipped"""
+    for line_no, line in enumerate(lines, start=1):
+        if not line.strip():
+            continue
+        try:
+            yield line_no, json.loads(line)
+        except ValueError as e:
+            yield line_no, e
+
+
+class CatalogImportService:
+    """Upserts streamed catalog rows into sweets in batches
+    
+    Each batch is one executemany INSERT ... ON CONFLICT (id) DO UPDATE and one
+    commit. Rows carrying an id update that sweet; rows without one update the
+    sweet with the same name, if any, and are inserted otherwise. Updates only
+    set the columns present in the row. Invalid rows
+    are reported and skipped; if a batch fails in the database it is retried
+    row by row so only the offending rows are rejected.
+    """
+    
+    def __init__(self, db: Session):
+        self.db = db
+    
+    def import_rows(self, rows: Iterable[Tuple[int, dict]], batch_size: int = 1000) -> dict:
+        """Import (line number, raw row) pairs and return a report"""
+        report = {"inserted": 0, "updated": 0, "failed": 0, "errors": []}
+        rows = iter(rows)
+        
+        while True:
+            chunk = list(islice(rows, batch_size))
+            if not chunk:
+                break
+            
+            batch = []
+            for line_no, raw in chunk:
+                try:
+                    if isinstance(raw, Exception):
+                        raise raw
+                    if not isinstance(raw, dict):
+                        raise ValueError("Row must be an object")
+                    batch.append((line_no, SweetImportRow.model_validate(raw)))
+                except (ValueError, ValidationError) as e:
+                    self._record_error(report, line_no, e)
+            
+            if batch:
+                self._write_batch(batch, report)
+        
+        catalog_cache.clear()
+        return report
+    
+    def _write_batch(self, batch: List[Tuple[int, SweetImportRow]], report: dict) -> None:
+        try:
+            inserted, updated = self._upsert(batch)
+            self.db.commit()
+        except Exception:
+            self.db.rollback()
+            if len(batch) == 1:
+                raise
+            for line in batch:
+                try:
+                    self._write_batch([line], report)
+                except Exception as e:
+                    self.db.rollback()
+                    self._record_error(report, line[0], e)
+            return
+        
+        report["inserted"] += inserted
+        report["updated"] += updated
+    
+    def _upsert(self, batch: List[Tuple[int, SweetImportRow]]) -> Tuple[int, int]:
+        ids = {row.id for _, row in batch if row.id is not None}
+        names = {row.name for _, row in batch if row.id is None}
+        
+        existing_ids = set()
+        if ids:
+            existing_ids = set(self.db.scalars(select(Sweet.id).where(Sweet.id.in_(ids))))
+        ids_by_name = {}
+        if names:
+            ids_by_name = dict(self.db.execute(
+                select(Sweet.name, Sweet.id).where(Sweet.name.in_(names)).order_by(Sweet.id.desc())
+            ).all())
+        
+        # Later lines win when a batch repeats a sweet. Updates only touch the
+        # columns a line gives; schema defaults are for inserts alone.
+        now = datetime.utcnow()
+        updates, inserts = {}, {}
+        for _, row in batch:
+            sweet_id = row.id if row.id is not None else ids_by_name.get(row.name)
+            if sweet_id is not None and (row.id is None or sweet_id in existing_ids):
+                values = row.model_dump(include=set(IMPORT_COLUMNS), exclude_unset=True)
+                updates[sweet_id] = {**updates.get(sweet_id, {"id": sweet_id}), **values, "updated_at": now}
+            elif row.id is not None:
+                inserts[("id", row.id)] = {"id": row.id, **row.model_dump(include=set(IMPORT_COLUMNS))}
+            else:
+                inserts[("name", row.name)] = row.model_dump(include=set(IMPORT_COLUMNS))
+        
+        # executemany needs the same keys in every row, so group by column set
+        by_columns = {}
+        for values in updates.values():
+            by_columns.setdefault(tuple(sorted(values)), []).append(values)
+        for columns, rows in by_columns.items():
+            self.db.execute(self._upsert_statement([c for c in columns if c != "id"]), rows)
+        
+        with_id = [values for key, values in inserts.items() if key[0] == "id"]
+        without_id = [values for key, values in inserts.items() if key[0] == "name"]
+        if with_id:
+            self.db.execute(insert(Sweet.__table__), with_id)
+        if without_id:
+            self.db.execute(insert(Sweet.__table__), without_id)
+        
+        return len(inserts), len(updates)
+    
+    def _upsert_statement(self, columns: List[str]):
+        """INSERT ... ON CONFLICT (id) DO UPDATE of just `columns`"""
+        dialect = self.db.get_bind().dialect.name
+        if dialect == "postgresql":
+            stmt = postgresql.insert(Sweet.__table__)
+        elif dialect == "sqlite":
+            stmt = sqlite.insert(Sweet.__table__)
+        else:
+            raise ValueError(f"Bulk import is not supported on {dialect}")
+        
+        return stmt.on_conflict_do_update(
+            index_elements=[Sweet.id],
+            set_={column: stmt.excluded[column] for column in columns}
+        )
+    
+    @staticmethod
+    def _record_error(report: dict, line_no: int, error: Exception) -> None:
+        report["failed"] += 1
+        if len(report["errors"]) < MAX_REPORTED_ERRORS:
+            if isinstance(error, ValidationError):
+                message = "; ".join(
+                    f"{'.'.join(str(part) for part in err['loc'])}: {err['msg']}"
+                    for err in error.errors()
+                )
+            else:
+                message = str(error).splitlines()[0]
+            report["errors"].append({"line": line_no, "error": message})
@@ -0,0 +1,183 @@
+import logging
+import queue
+import threading
+import time
+from concurrent.futures import Future, TimeoutError
+from app.config import settings
+from app.database import SessionLocal
+from app.services.inventory_service import InventoryService
+from app.utils.exceptions import ServiceUnavailableException
+
+logger = logging.getLogger(__name__)
+
+
+class GroupCommitWriter:
+    """Single writer thread that applies queued purchases and restocks in batches
+    
+    Callers block on a future while the writer drains the queue, collecting up
+    to `max_batch` operations or waiting at most `max_delay_ms` after the first
+    one, and commits the whole batch at once. Each caller gets its own result
+    or its own error; an invalid operation does not affect the rest. Callers
+    wait at most `result_timeout` seconds and then get a
+    ServiceUnavailableException.
+    """
+    
+    def __init__(
+        self,
+        session_factory=SessionLocal,
+        max_batch: int = settings.GROUP_COMMIT_MAX_BATCH,
+        max_delay_ms: float = settings.GROUP_COMMIT_MAX_DELAY_MS,
+        result_timeout: float = settings.GROUP_COMMIT_RESULT_TIMEOUT_SECONDS
+    ):
+        self.session_factory = session_factory
+        self.max_batch = max_batch
+        self.max_delay = max_delay_ms / 1000
+        self.result_timeout = result_timeout
+        self.batches = 0
+        self.operations = 0
+        self._queue = queue.Queue()
+        self._thread = None
+        self._lock = threading.Lock()
+    
+    def start(self) -> None:
+        """Start the writer thread if it is not running"""
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(
+                    target=self._run,
+                    name="group-commit-writer",
+                    daemon=True
+                )
+                self._thread.start()
+    
+    def stop(self, timeout: float = 5.0) -> None:
+        """Flush queued operations and stop the writer thread"""
+        with self._lock:
+            thread, self._thread = self._thread, None
+        if thread is not None:
+            self._queue.put(None)
+            thread.join(timeout)
+    
+    def submit(self, action: str, **kwargs) -> Future:
+        """Queue a 'purchase' or 'restock' and return its future"""
+        self.start()
+        future = Future()
+        self._queue.put((action, kwargs, future))
+        return future
+    
+    def purchase_sweet(self, user_id: int, sweet_id: int, quantity: int):
+        """Purchase a sweet through the writer and wait for the result"""
+        return self._wait(self.submit(
+            "purchase",
+            user_id=user_id,
+            sweet_id=sweet_id,
+            quantity=quantity
+        ))
+    
+    def restock_sweet(self, sweet_id: int, quantity: int, user_id: int, notes: str = ""):
+        """Restock a sweet through the writer and wait for the result"""
+        return self._wait(self.submit(
+            "restock",
+            sweet_id=sweet_id,
+            quantity=quantity,
+            user_id=user_id,
+            notes=notes
+        ))
+    
+    def stats(self) -> dict:
+        """Get batch counters and current queue depth"""
+        return {
+            "batches": self.batches,
+            "operations": self.operations,
+            "queue_depth": self._queue.qsize(),
+        }
+    
+    def _wait(self, future: Future):
+        try:
+            return future.result(timeout=self.result_timeout)
+        except TimeoutError:
+            # Still queued: drop it. Already running: it may yet be applied.
+            if future.cancel():
+                raise ServiceUnavailableException("Write queue is busy, please retry")
+            raise ServiceUnavailableException("Write is taking too long; check the result before retrying")
+    
+    def _run(self) -> None:
+        while True:
+            item = self._queue.get()
+            if item is None:
+                return
+            
+            batch = [item]
+            stopping = False
+            deadline = time.monotonic() + self.max_delay
+            while len(batch) < self.max_batch:
+                timeout = deadline - time.monotonic()
+                if timeout <= 0:
+                    break
+                try:
+                    item = self._queue.get(timeout=timeout)
+                except queue.Empty:
+                    break
+                if item is None:
+                    stopping = True
+                    break
+                batch.append(item)
+            
+            batch = [op for op in batch if op[2].set_running_or_notify_cancel()]
+            if batch:
+                try:
+                    self._commit_batch(batch)
+                except Exception as e:
+                    # Never let the writer thread die; fail whatever is unresolved
+                    logger.exception("Group commit writer failed a batch")
+                    for _, _, future in batch:
+                        if not future.done():
+                            future.set_exception(e)
+            if stopping:
+                return
+    
+    def _commit_batch(self, batch: list) -> None:
+        outcomes = []
+        inventory_service = None
+        try:
+            inventory_service = InventoryService(self.session_factory(expire_on_commit=False))
+            for action, kwargs, future in batch:
+                try:
+                    outcomes.append((future, self._apply(inventory_service, action, kwargs), None))
+                except ValueError as e:
+                    outcomes.append((future, None, e))
+            inventory_service.commit()
+        except Exception as e:
+            if inventory_service is not None:
+                inventory_service.rollback()
+            if len(batch) > 1:
+                # Something unexpected broke the batch; retry each operation
+                # on its own so only the offending one fails
+                logger.warning(f"Group commit of {len(batch)} operations failed: {e}")
+                for op in batch:
+                    self._commit_batch([op])
+            else:
+                batch[0][2].set_exception(e)
+            return
+        finally:
+            if inventory_service is not None:
+                inventory_service.db.close()
+        
+        self.batches += 1
+        self.operations += len(batch)
+        for future, result, error in outcomes:
+            if error is not None:
+                future.set_exception(error)
+            else:
+                future.set_result(result)
+    
+    @staticmethod
+    def _apply(inventory_service: InventoryService, action: str, kwargs: dict):
+        if action == "purchase":
+            return inventory_service._apply_purchase(**kwargs)
+        if action == "restock":
+            return inventory_service._apply_restock(**kwargs)
+        raise ValueError(f"Unknown action '{action}'")
+
+
+group_commit_writer = GroupCommitWriter()
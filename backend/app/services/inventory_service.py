@@ -1,9 +1,38 @@
+from datetime import datetime, timezone
+from sqlalchemy import Row, insert
 from sqlalchemy.orm import Session
-from typing import List
+from typing import Dict, List, Optional, Tuple
 from app.repositories.sweet_repository import SweetRepository
 from app.repositories.purchase_repository import PurchaseRepository
 from app.repositories.user_repository import UserRepository
+from app.repositories.sales_repository import SalesRepository
+from app.repositories.inventory_log_repository import InventoryLogRepository
 from app.models.inventory_log import InventoryLog
+from app.services.sweet_service import catalog_cache
+from app.services.stock_events import stock_events
+from app.utils.pagination import encode_cursor, decode_cursor
+
+
+def _naive_utc(value: Optional[datetime]) -> Optional[datetime]:
+    """Timestamps are stored as naive UTC; normalise aware datetimes to match"""
+    if value is not None and value.tzinfo is not None:
+        return value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value
+
+
+def _time_cursor(cursor: str, key: str) -> Tuple[datetime, int]:
+    """Decode a keyset cursor over a timestamp column into (timestamp, id)
+    
+    Raises ValueError for cursors on another key or whose value is not an
+    ISO timestamp.
+    """
+    cursor_key, value, last_id = decode_cursor(cursor)
+    if cursor_key != key or not isinstance(value, str):
+        raise ValueError("Invalid cursor")
+    try:
+        return datetime.fromisoformat(value), last_id
+    except ValueError:
+        raise ValueError("Invalid cursor")
 
 
 class InventoryService:
@@ -12,69 +41,303 @@ class InventoryService:
         self.sweet_repo = SweetRepository(db)
         self.purchase_repo = PurchaseRepository(db)
         self.user_repo = UserRepository(db)
+        self.sales_repo = SalesRepository(db)
+        self.inventory_log_repo = InventoryLogRepository(db)
+        # New stock levels written in the current transaction, published on commit
+        self.stock_levels: Dict[int, int] = {}
     
     def purchase_sweet(self, user_id: int, sweet_id: int, quantity: int):
-        """Purchase a sweet"""
-        sweet = self.sweet_repo.get_by_id(sweet_id)
+        """Purchase a sweet
         
-        if not sweet:
-            raise ValueError("Sweet not found")
+        The stock decrement, purchase record, inventory log and daily sales
+        rollup are written in a single transaction. Stock is only taken when
+        enough is left, so concurrent buyers cannot oversell.
+        """
+        try:
+            purchase = self._apply_purchase(user_id, sweet_id, quantity)
+        except ValueError:
+            self.rollback()
+            raise
+        
+        self.commit()
+        self.db.refresh(purchase)
+        
+        return purchase
+    
+    def checkout(self, user_id: int, items: List[Dict[str, int]]):
+        """Purchase several sweets at once, all or nothing
+        
+        `items` is a list of {"sweet_id", "quantity"} lines. Every line is
+        decremented, recorded and logged in one transaction; if any line
+        fails nothing is written.
+        """
+        if not items:
+            raise ValueError("Cart is empty")
+        
+        # Merge repeated lines and take stock in a stable order
+        quantities = {}
+        for item in items:
+            if item["quantity"] <= 0:
+                raise ValueError("Quantity must be positive")
+            quantities[item["sweet_id"]] = quantities.get(item["sweet_id"], 0) + item["quantity"]
+        
+        purchase_rows = []
+        log_rows = []
+        sale_date = datetime.utcnow().date()
+        for sweet_id, quantity in sorted(quantities.items()):
+            stock = self.sweet_repo.decrement_stock(sweet_id, quantity)
+            
+            if stock is None:
+                self.rollback()
+                if not self.sweet_repo.get_by_id(sweet_id):
+                    raise ValueError(f"Sweet {sweet_id} not found")
+                raise ValueError(f"Insufficient stock for sweet {sweet_id}")
+            
+            self.stock_levels[sweet_id] = stock.quantity
+            purchase_rows.append({
+                "user_id": user_id,
+                "sweet_id": sweet_id,
+                "quantity": quantity,
+                "total_price": float(stock.price) * quantity
+            })
+            log_rows.append({
+                "sweet_id": sweet_id,
+                "action": "PURCHASE",
+                "quantity_change": -quantity,
+                "performed_by": user_id,
+                "notes": f"Purchase of {quantity} units by user {user_id}"
+            })
+        
+        try:
+            purchases = self.purchase_repo.create_many(purchase_rows, commit=False)
+            self._create_inventory_logs(log_rows, commit=False)
+            self.sales_repo.record([
+                {
+                    "sale_date": sale_date,
+                    "sweet_id": row["sweet_id"],
+                    "units": row["quantity"],
+                    "revenue": row["total_price"],
+                    "purchases": 1
+                }
+                for row in purchase_rows
+            ])
+            self.commit()
+        except Exception:
+            self.rollback()
+            raise
+        
+        return purchases
+    
+    def restock_sweet(self, sweet_id: int, quantity: int, user_id: int, notes: str = ""):
+        """Restock a sweet"""
+        try:
+            log = self._apply_restock(sweet_id, quantity, user_id, notes)
+        except ValueError:
+            self.rollback()
+            raise
+        
+        self.commit()
+        self.db.refresh(log)
+        
+        return log
+    
+    def bulk_restock(self, items: List[Dict], user_id: int, notes: str = "") -> List[dict]:
+        """Restock every line of a delivery manifest in one transaction
+        
+        `items` is a list of {"sweet_id", "quantity", "notes"} lines. Lines for
+        unknown sweets or with a non-positive quantity are skipped; the rest
+        are applied with one batched UPDATE and one batched log INSERT.
+        Returns a result per line, in manifest order.
+        """
+        if not items:
+            raise ValueError("Manifest is empty")
+        
+        existing = self.sweet_repo.get_quantities([item["sweet_id"] for item in items])
+        results = []
+        applied = []
+        log_rows = []
+        for line, item in enumerate(items, start=1):
+            sweet_id, quantity = item["sweet_id"], item["quantity"]
+            result = {"line": line, "sweet_id": sweet_id, "quantity": quantity}
+            results.append(result)
+            
+            if quantity <= 0:
+                result["status"] = "error"
+                result["error"] = "Quantity must be positive"
+            elif sweet_id not in existing:
+                result["status"] = "error"
+                result["error"] = "Sweet not found"
+            else:
+                result["status"] = "restocked"
+                applied.append((sweet_id, quantity))
+                log_rows.append({
+                    "sweet_id": sweet_id,
+                    "action": "RESTOCK",
+                    "quantity_change": quantity,
+                    "performed_by": user_id,
+                    "notes": item.get("notes") or notes or f"Restock of {quantity} units"
+                })
+        
+        if applied:
+            try:
+                self.sweet_repo.increment_stock_many(applied)
+                self._create_inventory_logs(log_rows, commit=False)
+                stock = self.sweet_repo.get_quantities([sweet_id for sweet_id, _ in applied])
+                self.stock_levels.update(stock)
+                self.commit()
+            except Exception:
+                self.rollback()
+                raise
+            
+            for result in results:
+                if result["status"] == "restocked":
+                    result["new_quantity"] = stock[result["sweet_id"]]
+        
+        return results
+    
+    def get_inventory_history(
+        self,
+        sweet_id: int,
+        since: Optional[datetime] = None,
+        until: Optional[datetime] = None,
+        action: Optional[str] = None,
+        limit: int = 100,
+        cursor: Optional[str] = None
+    ) -> Tuple[List[Row], Optional[str]]:
+        """Get a page of inventory history for a sweet, newest first, plus the next cursor
+        
+        Logs are plain rows of the inventory_logs columns. `since` is inclusive
+        and `until` exclusive.
+        """
+        before = _time_cursor(cursor, "created_at") if cursor else None
+        
+        # Fetch one extra row to find out whether another page exists
+        logs = self.inventory_log_repo.get_sweet_page(
+            sweet_id, limit + 1, before, _naive_utc(since), _naive_utc(until), action
+        )
+        if len(logs) <= limit:
+            return logs, None
+        
+        logs = logs[:limit]
+        return logs, encode_cursor("created_at", logs[-1].created_at.isoformat(), logs[-1].id)
+    
+    def get_user_purchases(
+        self,
+        user_id: int,
+        limit: int = 100,
+        cursor: Optional[str] = None
+    ) -> Tuple[List[dict], Optional[str]]:
+        """Get a page of a user's purchases, newest first, plus the next cursor"""
+        before = _time_cursor(cursor, "purchase_date") if cursor else None
+        
+        # Fetch one extra row to find out whether another page exists
+        rows = self.purchase_repo.get_user_page(user_id, limit + 1, before)
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            next_cursor = encode_cursor("purchase_date", rows[-1].purchase_date.isoformat(), rows[-1].id)
+        
+        purchases = [
+            {
+                "id": row.id,
+                "user_id": row.user_id,
+                "sweet_id": row.sweet_id,
+                "sweet_name": row.sweet_name,
+                "quantity": row.quantity,
+                "total_price": float(row.total_price),
+                "purchased_at": row.purchase_date.isoformat()
+            }
+            for row in rows
+        ]
+        return purchases, next_cursor
+    
+    def _apply_purchase(self, user_id: int, sweet_id: int, quantity: int):
+        """Take stock and add the purchase and log rows, without committing
         
-        if sweet.quantity < quantity:
+        Raises ValueError, having written nothing, when the purchase is invalid.
+        """
+        if quantity <= 0:
+            raise ValueError("Quantity must be positive")
+        
+        stock = self.sweet_repo.decrement_stock(sweet_id, quantity)
+        
+        if stock is None:
+            if not self.sweet_repo.get_by_id(sweet_id):
+                raise ValueError("Sweet not found")
             raise ValueError("Insufficient stock")
+        self.stock_levels[sweet_id] = stock.quantity
         
         # Create purchase record
-        total_price = float(sweet.price) * quantity
         purchase = self.purchase_repo.create(
             user_id=user_id,
             sweet_id=sweet_id,
             quantity=quantity,
-            total_price=total_price
+            total_price=float(stock.price) * quantity,
+            commit=False
         )
         
-        # Update sweet quantity
-        sweet.quantity -= quantity
-        self.db.commit()
-        
         # Log inventory change
         self._create_inventory_log(
             sweet_id=sweet_id,
             action="PURCHASE",
             quantity_change=-quantity,
             performed_by=user_id,
-            notes=f"Purchase of {quantity} units by user {user_id}"
+            notes=f"Purchase of {quantity} units by user {user_id}",
+            commit=False
         )
         
+        # Roll the sale into the day's totals for analytics
+        self.sales_repo.record([{
+            "sale_date": datetime.utcnow().date(),
+            "sweet_id": sweet_id,
+            "units": quantity,
+            "revenue": float(stock.price) * quantity,
+            "purchases": 1
+        }])
+        
         return purchase
     
-    def restock_sweet(self, sweet_id: int, quantity: int, user_id: int, notes: str = ""):
-        """Restock a sweet"""
-        sweet = self.sweet_repo.get_by_id(sweet_id)
+    def _apply_restock(self, sweet_id: int, quantity: int, user_id: int, notes: str = ""):
+        """Add stock and the log row, without committing
         
-        if not sweet:
-            raise ValueError("Sweet not found")
+        Raises ValueError, having written nothing, when the quantity is not
+        positive or the sweet does not exist.
+        """
+        if quantity <= 0:
+            raise ValueError("Quantity must be positive")
         
-        previous_quantity = sweet.quantity
-        sweet.quantity += quantity
-        self.db.commit()
+        new_quantity = self.sweet_repo.increment_stock(sweet_id, quantity)
+        if new_quantity is None:
+            raise ValueError("Sweet not found")
+        self.stock_levels[sweet_id] = new_quantity
         
         # Log inventory change
-        log = self._create_inventory_log(
+        return self._create_inventory_log(
             sweet_id=sweet_id,
             action="RESTOCK",
             quantity_change=quantity,
             performed_by=user_id,
-            notes=notes or f"Restock of {quantity} units"
+            notes=notes or f"Restock of {quantity} units",
+            commit=False
         )
-        
-        return log
     
-    def get_inventory_history(self, sweet_id: int) -> List[InventoryLog]:
-        """Get inventory history for a sweet"""
-        return self.db.query(InventoryLog)\
-            .filter(InventoryLog.sweet_id == sweet_id)\
-            .order_by(InventoryLog.created_at.desc())\
-            .all()
+    def commit(self) -> None:
+        """Commit, then invalidate cached catalog reads and publish the new stock levels"""
+        self.db.commit()
+        catalog_cache.clear()
+        levels, self.stock_levels = self.stock_levels, {}
+        stock_events.publish(levels)
+    
+    def rollback(self) -> None:
+        """Roll back and forget stock levels from the abandoned transaction"""
+        self.db.rollback()
+        self.stock_levels = {}
+    
+    def _create_inventory_logs(self, rows: List[dict], commit: bool = True) -> None:
+        """Bulk insert inventory log entries from dicts of column values"""
+        self.db.execute(insert(InventoryLog), rows)
+        if commit:
+            self.db.commit()
     
     def _create_inventory_log(
         self,
@@ -82,9 +345,10 @@ class InventoryService:
         action: str,
         quantity_change: int,
         performed_by: int,
-        notes: str = None
+        notes: str = None,
+        commit: bool = True
     ) -> InventoryLog:
-        """Create an inventory log entry"""
+        """Create an inventory log entry, or just add it to the session if commit is False"""
         log = InventoryLog(
             sweet_id=sweet_id,
             action=action,
@@ -93,6 +357,7 @@ class InventoryService:
             notes=notes
         )
         self.db.add(log)
-        self.db.commit()
-        self.db.refresh(log)
+        if commit:
+            self.db.commit()
+            self.db.refresh(log)
         return log
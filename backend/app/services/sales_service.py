@@ -0,0 +1,49 @@
+from datetime import date, datetime, timedelta
+from sqlalchemy.orm import Session
+from typing import List, Optional, Tuple
+from app.repositories.sales_repository import SalesRepository
+
+# Reports cover this many days, ending today, when no range is given
+DEFAULT_RANGE_DAYS = 30
+
+
+class SalesService:
+    """Sales analytics read from the daily rollup, never from purchase history"""
+    
+    def __init__(self, db: Session):
+        self.db = db
+        self.sales_repo = SalesRepository(db)
+    
+    def get_summary(self, start: Optional[date] = None, end: Optional[date] = None) -> Tuple[date, date, dict]:
+        """Get total units, revenue and purchases over a date range"""
+        start, end = self._date_range(start, end)
+        return start, end, self.sales_repo.get_summary(start, end)._asdict()
+    
+    def get_daily(
+        self,
+        start: Optional[date] = None,
+        end: Optional[date] = None,
+        sweet_id: Optional[int] = None
+    ) -> Tuple[date, date, List[dict]]:
+        """Get units, revenue and purchases per day with sales, optionally for one sweet"""
+        start, end = self._date_range(start, end)
+        return start, end, [row._asdict() for row in self.sales_repo.get_daily(start, end, sweet_id)]
+    
+    def get_by_sweet(
+        self,
+        start: Optional[date] = None,
+        end: Optional[date] = None,
+        limit: int = 100
+    ) -> Tuple[date, date, List[dict]]:
+        """Get units, revenue and purchases per sweet, highest revenue first"""
+        start, end = self._date_range(start, end)
+        return start, end, [row._asdict() for row in self.sales_repo.get_by_sweet(start, end, limit)]
+    
+    @staticmethod
+    def _date_range(start: Optional[date], end: Optional[date]) -> Tuple[date, date]:
+        """Fill in a missing bound and check the range; both bounds are inclusive UTC days"""
+        end = end or datetime.utcnow().date()
+        start = start or end - timedelta(days=DEFAULT_RANGE_DAYS - 1)
+        if start > end:
+            raise ValueError("start must not be after end")
+        return start, end
@@ -0,0 +1,149 @@
+import asyncio
+import threading
+from typing import AsyncIterator, Dict, Optional, Tuple
+from app.config import settings
+from app.utils.serialization import dumps
+
+
+class StockSubscription:
+    """One stream's pending stock levels, keyed by sweet id
+    
+    A newer level for a sweet replaces the pending one, so a slow client gets
+    the latest quantity once instead of every step. More than `max_pending`
+    distinct sweets marks the subscription as overflowed: pending levels are
+    dropped and the client is told to resync.
+    """
+    
+    def __init__(self, loop: asyncio.AbstractEventLoop, max_pending: int):
+        self.max_pending = max_pending
+        self._loop = loop
+        self._event = asyncio.Event()
+        self._lock = threading.Lock()
+        self._pending: Dict[int, int] = {}
+        self._overflowed = False
+    
+    def offer(self, levels: Dict[int, int]) -> int:
+        """Queue new stock levels from any thread; returns how many replaced pending ones"""
+        coalesced = 0
+        with self._lock:
+            for sweet_id, quantity in levels.items():
+                if sweet_id in self._pending:
+                    coalesced += 1
+                elif len(self._pending) >= self.max_pending:
+                    self._pending.clear()
+                    self._overflowed = True
+                    break
+                self._pending[sweet_id] = quantity
+        try:
+            self._loop.call_soon_threadsafe(self._event.set)
+        except RuntimeError:
+            pass  # the stream's event loop has closed
+        return coalesced
+    
+    async def wait(self, timeout: float) -> bool:
+        """Wait until something is pending; False on timeout"""
+        try:
+            await asyncio.wait_for(self._event.wait(), timeout)
+            return True
+        except asyncio.TimeoutError:
+            return False
+    
+    def drain(self) -> Tuple[Dict[int, int], bool]:
+        """Take the pending levels and whether the subscription overflowed"""
+        self._event.clear()
+        with self._lock:
+            pending, self._pending = self._pending, {}
+            overflowed, self._overflowed = self._overflowed, False
+        return pending, overflowed
+
+
+class StockEventBroadcaster:
+    """In-process fan-out of stock level changes to Server-Sent Event streams
+    
+    Writers call `publish` after commit with {sweet_id: new quantity}; every
+    open stream gets the change through its own bounded, coalescing
+    subscription, so a stalled client never blocks writers or other clients.
+    """
+    
+    def __init__(
+        self,
+        max_pending: int = settings.STOCK_EVENTS_MAX_PENDING,
+        coalesce_ms: float = settings.STOCK_EVENTS_COALESCE_MS,
+        keepalive_seconds: float = settings.STOCK_EVENTS_KEEPALIVE_SECONDS
+    ):
+        self.max_pending = max_pending
+        self.coalesce = coalesce_ms / 1000
+        self.keepalive = keepalive_seconds
+        self.published = 0
+        self.coalesced = 0
+        self.overflows = 0
+        self._subscribers = set()
+        self._lock = threading.Lock()
+    
+    def subscribe(self) -> StockSubscription:
+        """Open a subscription on the running event loop"""
+        subscription = StockSubscription(asyncio.get_running_loop(), self.max_pending)
+        with self._lock:
+            self._subscribers.add(subscription)
+        return subscription
+    
+    def unsubscribe(self, subscription: StockSubscription) -> None:
+        """Close a subscription"""
+        with self._lock:
+            self._subscribers.discard(subscription)
+    
+    def publish(self, levels: Dict[int, int]) -> None:
+        """Push new stock levels to every subscriber; safe from any thread"""
+        if not levels:
+            return
+        with self._lock:
+            subscribers = list(self._subscribers)
+            self.published += len(levels)
+        coalesced = sum(subscription.offer(levels) for subscription in subscribers)
+        with self._lock:
+            self.coalesced += coalesced
+    
+    def stats(self) -> dict:
+        """Get subscriber count and delivery counters"""
+        with self._lock:
+            return {
+                "subscribers": len(self._subscribers),
+                "published": self.published,
+                "coalesced": self.coalesced,
+                "overflows": self.overflows,
+            }
+    
+    async def stream(self, subscription: Optional[StockSubscription] = None) -> AsyncIterator[bytes]:
+        """Encode a subscription as an SSE stream of `stock` events
+        
+        Each event's data is {"sweet_id", "quantity"} with the sweet's current
+        stock. A `resync` event means updates were dropped and the client
+        should refetch the catalog.
+        """
+        subscription = subscription or self.subscribe()
+        try:
+            yield b"retry: 3000\n\n"
+            while True:
+                if not await subscription.wait(self.keepalive):
+                    yield b": keepalive\n\n"
+                    continue
+                
+                # Let a burst of updates to the same sweets collapse before sending
+                if self.coalesce:
+                    await asyncio.sleep(self.coalesce)
+                
+                levels, overflowed = subscription.drain()
+                if overflowed:
+                    with self._lock:
+                        self.overflows += 1
+                    yield b"event: resync\ndata: {}\n\n"
+                if levels:
+                    yield b"".join(
+                        b"event: stock\ndata: " + dumps({"sweet_id": sweet_id, "quantity": quantity}) + b"\n\n"
+                        for sweet_id, quantity in levels.items()
+                    )
+        finally:
+            self.unsubscribe(subscription)
+
+
+stock_events = StockEventBroadcaster()
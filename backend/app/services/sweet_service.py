@@ -1,7 +1,100 @@
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from typing import List, Optional
-from app.schemas.sweet import SweetCreate, SweetUpdate
-from app.repositories.sweet_repository import SweetRepository
+from typing import List, Optional, Tuple
+from app.config import settings
+from app.schemas.sweet import Sweet, SweetBulkUpdate, SweetCreate, SweetUpdate
+from app.repositories.sweet_repository import AsyncSweetRepository, SweetRepository, SORT_KEYS, SWEET_COLUMNS, SWEET_FIELDS
+from app.utils.pagination import encode_cursor, decode_cursor
+from app.utils.cache import TTLCache
+from app.utils.singleflight import SingleFlight
+
+# Process-wide cache of serialized catalog reads. Every write to sweets
+# (including stock changes from InventoryService) must clear it.
+catalog_cache = TTLCache(
+    maxsize=settings.CATALOG_CACHE_SIZE,
+    ttl=settings.CATALOG_CACHE_TTL_SECONDS
+)
+
+# Concurrent cache misses for the same read share one query
+catalog_flight = SingleFlight()
+
+
+def _load_shared(key: tuple, loader):
+    """Serve a catalog read from the cache, collapsing concurrent misses into one load
+    
+    Flights are keyed by cache generation, so a read that starts after a write
+    never joins a load that began before it.
+    """
+    return catalog_cache.get_or_load(
+        key,
+        lambda: catalog_flight.do((catalog_cache.generation, key), loader)
+    )
+
+
+async def _load_shared_async(key: tuple, loader):
+    """_load_shared for an async loader; it shares cache entries and flights with sync reads"""
+    return await catalog_cache.get_or_load_async(
+        key,
+        lambda: catalog_flight.do_async((catalog_cache.generation, key), loader)
+    )
+
+
+def parse_fields(fields: Optional[str] = None) -> Tuple[str, ...]:
+    """Turn a `fields=a,b` sparse fieldset into response field names
+    
+    `id` is always included; no fieldset means every field.
+    """
+    if not fields:
+        return tuple(SWEET_FIELDS)
+    
+    names = [name.strip() for name in fields.split(",") if name.strip()]
+    for name in names:
+        if name not in SWEET_FIELDS:
+            raise ValueError(f"Unknown field '{name}'")
+    
+    # Keep schema order so equal fieldsets share cache entries
+    return tuple(name for name in SWEET_FIELDS if name == "id" or name in names)
+
+
+def _columns(fields: Tuple[str, ...]) -> list:
+    return [SWEET_FIELDS[name] for name in fields]
+
+
+def _page_request(order_by: Optional[str], cursor: Optional[str], fields: Optional[str]):
+    """Resolve keyset page arguments into (order_by, after, fields, selected columns)"""
+    after = None
+    if cursor:
+        order_by, value, last_id = decode_cursor(cursor)
+        after = (value, last_id)
+    order_by = order_by or "id"
+    
+    if order_by not in SORT_KEYS:
+        raise ValueError(f"Cannot order by '{order_by}'")
+    
+    # The sort key is needed for the cursor even when it was not asked for
+    fields = parse_fields(fields)
+    selected = fields if order_by in fields else fields + (order_by,)
+    return order_by, after, fields, selected
+
+
+def _page_result(
+    rows: list,
+    limit: int,
+    order_by: str,
+    fields: Tuple[str, ...],
+    selected: Tuple[str, ...]
+) -> Tuple[List[dict], Optional[str]]:
+    """Turn limit + 1 fetched rows into response-ready dicts and the next cursor"""
+    sweets = [row._asdict() for row in rows[:limit]]
+    next_cursor = None
+    if len(rows) > limit:
+        last = sweets[-1]
+        next_cursor = encode_cursor(order_by, last[order_by], last["id"])
+    
+    if selected is not fields:
+        for sweet in sweets:
+            del sweet[order_by]
+    return sweets, next_cursor
 
 
 class SweetService:
@@ -9,22 +102,109 @@ class SweetService:
         self.db = db
         self.sweet_repo = SweetRepository(db)
     
+    def get_catalog_version(self) -> int:
+        """Catalog change version, a single-row read used to version catalog responses"""
+        return _load_shared(("catalog_version",), self.sweet_repo.get_catalog_version)
+    
     def get_all_sweets(
         self,
         skip: int = 0,
         limit: int = 100,
-        category: Optional[str] = None
-    ) -> List:
-        """Get all sweets with optional category filter"""
-        return self.sweet_repo.get_all(skip, limit, category)
+        category: Optional[str] = None,
+        fields: Optional[str] = None
+    ) -> List[dict]:
+        """Get all sweets with optional category filter, as response-ready dicts"""
+        fields = parse_fields(fields)
+        return _load_shared(
+            ("list", skip, limit, category, fields),
+            lambda: [
+                row._asdict()
+                for row in self.sweet_repo.get_all(skip, limit, category, _columns(fields))
+            ]
+        )
+    
+    def get_sweets_page(
+        self,
+        limit: int = 100,
+        category: Optional[str] = None,
+        order_by: Optional[str] = None,
+        cursor: Optional[str] = None,
+        fields: Optional[str] = None
+    ) -> Tuple[List[dict], Optional[str]]:
+        """Get a page of sweets as response-ready dicts, using keyset pagination, plus the next cursor"""
+        order_by, after, fields, selected = _page_request(order_by, cursor, fields)
+        
+        # Fetch one extra row to find out whether another page exists
+        rows = self.sweet_repo.get_page(limit + 1, category, order_by, after, _columns(selected))
+        return _page_result(rows, limit, order_by, fields, selected)
+    
+    def search_sweets(
+        self,
+        q: str,
+        skip: int = 0,
+        limit: int = 100,
+        category: Optional[str] = None,
+        min_price: Optional[float] = None,
+        max_price: Optional[float] = None,
+        fields: Optional[str] = None
+    ) -> List[dict]:
+        """Search sweets by name, category and description, as response-ready dicts"""
+        columns = _columns(parse_fields(fields))
+        rows = self.sweet_repo.search(q, skip, limit, category, min_price, max_price, columns)
+        return [row._asdict() for row in rows]
+    
+    def get_changes(self, since: int = 0, limit: int = 1000) -> dict:
+        """Sweets created, updated or deleted after catalog version `since`
+        
+        Returns {"changes", "version", "has_more"}: changes are oldest first,
+        deleted sweets appear as {"id", "version", "deleted": True}, and
+        `version` is the `since` to pass next time. Tombstones are skipped on
+        a full sync (since=0).
+        """
+        if since < 0:
+            raise ValueError("since must not be negative")
+        
+        # Bound the read by the version seen up front so later writes are left for the next call
+        current = self.sweet_repo.get_catalog_version()
+        rows, tombstones = self.sweet_repo.get_changes(since, current, limit + 1, SWEET_COLUMNS)
+        
+        changes = [{**row._asdict(), "deleted": False} for row in rows]
+        if since > 0:
+            changes.extend(
+                {"id": tombstone.sweet_id, "version": tombstone.version, "deleted": True}
+                for tombstone in tombstones
+            )
+            changes.sort(key=lambda change: change["version"])
+        
+        has_more = len(changes) > limit
+        changes = changes[:limit]
+        return {
+            "changes": changes,
+            "version": changes[-1]["version"] if has_more else current,
+            "has_more": has_more
+        }
     
     def get_sweet_by_id(self, sweet_id: int):
         """Get a sweet by ID"""
-        return self.sweet_repo.get_by_id(sweet_id)
+        def load():
+            sweet = self.sweet_repo.get_by_id(sweet_id)
+            return Sweet.model_validate(sweet) if sweet else None
+        
+        return _load_shared(("sweet", sweet_id), load)
+    
+    def get_sweet_fields(self, sweet_id: int, fields: str) -> Optional[dict]:
+        """Get a sparse fieldset of a sweet by ID, as a response-ready dict"""
+        fields = parse_fields(fields)
+        
+        def load():
+            row = self.sweet_repo.get_row(sweet_id, _columns(fields))
+            return row._asdict() if row else None
+        
+        return _load_shared(("sweet", sweet_id, fields), load)
     
     def create_sweet(self, sweet_create: SweetCreate):
         """Create a new sweet"""
-        return self.sweet_repo.create(
+        sweet = self.sweet_repo.create(
             name=sweet_create.name,
             description=sweet_create.description,
             price=sweet_create.price,
@@ -32,6 +212,8 @@ class SweetService:
             category=sweet_create.category,
             image_url=sweet_create.image_url
         )
+        catalog_cache.clear()
+        return sweet
     
     def update_sweet(self, sweet_id: int, sweet_update: SweetUpdate):
         """Update a sweet"""
@@ -40,7 +222,51 @@ class SweetService:
             return None
         
         update_data = sweet_update.dict(exclude_unset=True)
-        return self.sweet_repo.update(sweet, update_data)
+        sweet = self.sweet_repo.update(sweet, update_data)
+        catalog_cache.clear()
+        return sweet
+    
+    def bulk_update_sweets(self, request: SweetBulkUpdate) -> dict:
+        """Apply many updates in one transaction using set-based UPDATEs"""
+        if (request.items is None) == (request.patch is None):
+            raise ValueError("Provide either items or filter and patch")
+        
+        try:
+            if request.items is not None:
+                rows = [
+                    {key: value for key, value in item.dict(exclude_unset=True).items() if value is not None}
+                    for item in request.items
+                ]
+                missing = self.sweet_repo.update_many(rows, commit=False)
+                result = {"updated": len(rows) - len(missing), "missing": missing}
+            else:
+                result = {"updated": self._update_matching(request), "missing": []}
+        except Exception:
+            self.db.rollback()
+            raise
+        
+        self.db.commit()
+        catalog_cache.clear()
+        return result
+    
+    def _update_matching(self, request: SweetBulkUpdate) -> int:
+        """Apply the patch to every sweet matching the filter, without committing"""
+        criteria = request.filter.dict(exclude_none=True) if request.filter else {}
+        if not criteria:
+            raise ValueError("Filter must not be empty")
+        
+        values = request.patch.dict(exclude_unset=True, exclude={"price_multiplier"})
+        values = {key: value for key, value in values.items() if value is not None}
+        multiplier = request.patch.price_multiplier
+        if multiplier is not None:
+            if multiplier <= 0:
+                raise ValueError("Price multiplier must be positive")
+            if "price" in values:
+                raise ValueError("Cannot set price and price_multiplier together")
+        elif not values:
+            raise ValueError("Patch must not be empty")
+        
+        return self.sweet_repo.update_where(values, multiplier, commit=False, **criteria)
     
     def delete_sweet(self, sweet_id: int) -> bool:
         """Delete a sweet"""
@@ -48,4 +274,47 @@ class SweetService:
         if not sweet:
             return False
         
-        return self.sweet_repo.delete(sweet)
+        deleted = self.sweet_repo.delete(sweet)
+        catalog_cache.clear()
+        return deleted
+
+
+class AsyncSweetService:
+    """asyncio counterpart of SweetService's hot catalog reads"""
+    
+    def __init__(self, db: AsyncSession):
+        self.db = db
+        self.sweet_repo = AsyncSweetRepository(db)
+    
+    async def get_catalog_version(self) -> int:
+        """Catalog change version, a single-row read used to version catalog responses"""
+        return await _load_shared_async(("catalog_version",), self.sweet_repo.get_catalog_version)
+    
+    async def get_all_sweets(
+        self,
+        skip: int = 0,
+        limit: int = 100,
+        category: Optional[str] = None,
+        fields: Optional[str] = None
+    ) -> List[dict]:
+        """Get all sweets with optional category filter, as response-ready dicts"""
+        fields = parse_fields(fields)
+        
+        async def load():
+            rows = await self.sweet_repo.get_all(skip, limit, category, _columns(fields))
+            return [row._asdict() for row in rows]
+        
+        return await _load_shared_async(("list", skip, limit, category, fields), load)
+    
+    async def get_sweets_page(
+        self,
+        limit: int = 100,
+        category: Optional[str] = None,
+        order_by: Optional[str] = None,
+        cursor: Optional[str] = None,
+        fields: Optional[str] = None
+    ) -> Tuple[List[dict], Optional[str]]:
+        """Get a page of sweets as response-ready dicts, using keyset pagination, plus the next cursor"""
+        order_by, after, fields, selected = _page_request(order_by, cursor, fields)
+        rows = await self.sweet_repo.get_page(limit + 1, category, order_by, after, _columns(selected))
+        return _page_result(rows, limit, order_by, fields, selected)
@@ -0,0 +1,97 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Hashable
+
+
+class TTLCache:
+    """Thread-safe, size-bounded LRU cache whose entries expire after a TTL"""
+    
+    def __init__(self, maxsize: int = 1024, ttl: float = 30.0):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        # Bumped by clear() so loads that straddle an invalidation are not cached
+        self.generation = 0
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+    
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Get a cached value, counting the lookup as a hit or a miss"""
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is not None and entry[0] > time.monotonic():
+                self._data.move_to_end(key)
+                self.hits += 1
+                return entry[1]
+            if entry is not None:
+                del self._data[key]
+            self.misses += 1
+            return default
+    
+    def set(self, key: Hashable, value: Any) -> None:
+        """Cache a value, evicting the least recently used entry when full"""
+        with self._lock:
+            self._store(key, value)
+    
+    def get_or_load(self, key: Hashable, loader: Callable[[], Any]) -> Any:
+        """Get a cached value, loading and caching it on a miss
+        
+        The loaded value is not cached if clear() ran while it was loading,
+        since it may predate the write that caused the clear.
+        """
+        missing = object()
+        value = self.get(key, missing)
+        if value is missing:
+            generation = self.generation
+            value = loader()
+            with self._lock:
+                if generation == self.generation:
+                    self._store(key, value)
+        return value
+    
+    async def get_or_load_async(self, key: Hashable, loader: Callable[[], Awaitable]) -> Any:
+        """get_or_load for a loader that returns an awaitable"""
+        missing = object()
+        value = self.get(key, missing)
+        if value is missing:
+            generation = self.generation
+            value = await loader()
+            with self._lock:
+                if generation == self.generation:
+                    self._store(key, value)
+        return value
+    
+    def delete(self, key: Hashable) -> None:
+        """Drop a single cached entry, if present"""
+        with self._lock:
+            self._data.pop(key, None)
+    
+    def clear(self) -> None:
+        """Drop every cached entry"""
+        with self._lock:
+            self._data.clear()
+            self.generation += 1
+    
+    def _store(self, key: Hashable, value: Any) -> None:
+        # Callers hold self._lock
+        if self.maxsize <= 0:
+            return
+        self._data[key] = (time.monotonic() + self.ttl, value)
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+    
+    def stats(self) -> dict:
+        """Get hit/miss counters and current size"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._data),
+                "maxsize": self.maxsize,
+                "ttl": self.ttl,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": self.hits / lookups if lookups else 0.0,
+            }
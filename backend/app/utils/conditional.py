@@ -0,0 +1,51 @@
+import hashlib
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Optional
+from fastapi import Request
+
+
+def make_etag(*parts) -> str:
+    """Strong ETag over the given version parts"""
+    digest = hashlib.sha1("|".join(str(part) for part in parts).encode()).hexdigest()
+    return f'"{digest[:32]}"'
+
+
+def cache_headers(etag: str, last_modified: Optional[datetime] = None) -> dict:
+    """ETag/Last-Modified headers; clients must revalidate before reusing a copy
+    
+    HTTP dates have whole-second resolution, so Last-Modified is only sent
+    once it is at least a second old (RFC 9110 8.8.2.2): any later write then
+    lands in a later second and fails If-Modified-Since.
+    """
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    # Timestamps are stored as naive UTC
+    if last_modified is not None and last_modified <= datetime.utcnow() - timedelta(seconds=1):
+        headers["Last-Modified"] = format_datetime(last_modified.replace(tzinfo=timezone.utc), usegmt=True)
+    return headers
+
+
+def is_not_modified(request: Request, etag: str, last_modified: Optional[datetime] = None) -> bool:
+    """Whether the request's validators still match, so a 304 can be sent
+    
+    If-None-Match takes precedence over If-Modified-Since (RFC 9110).
+    """
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        tags = [tag.strip() for tag in if_none_match.split(",")]
+        return "*" in tags or etag in tags or f"W/{etag}" in tags
+    
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since is None or last_modified is None:
+        return False
+    if last_modified > datetime.utcnow() - timedelta(seconds=1):
+        # Too recent to have been sent as Last-Modified; see cache_headers
+        return False
+    try:
+        since = parsedate_to_datetime(if_modified_since)
+    except (TypeError, ValueError):
+        return False
+    if since.tzinfo is None:
+        since = since.replace(tzinfo=timezone.utc)
+    # HTTP dates have whole-second resolution
+    return last_modified.replace(tzinfo=timezone.utc, microsecond=0) <= since
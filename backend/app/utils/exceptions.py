@@ -26,3 +26,8 @@ class InvalidDataException(CustomException):
 class InsufficientStockException(CustomException):
     """Raised when there's insufficient stock"""
     pass
+
+
+class ServiceUnavailableException(CustomException):
+    """Raised when a resource is overloaded and the request should be retried"""
+    pass
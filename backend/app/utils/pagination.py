@@ -0,0 +1,32 @@
+import base64
+import json
+from typing import Any, Tuple
+
+
+def encode_cursor(key: str, value: Any, last_id: int) -> str:
+    """Encode a keyset position as an opaque cursor"""
+    payload = json.dumps({"k": key, "v": value, "id": last_id}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[str, Any, int]:
+    """Decode a cursor into its (key, value, last_id) position
+    
+    Raises ValueError for anything encode_cursor could not have produced, so
+    tampered cursors never reach the database.
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        key, value, last_id = payload["k"], payload["v"], payload["id"]
+    except (ValueError, KeyError, TypeError):
+        raise ValueError("Invalid cursor")
+    
+    # bool is an int subclass but never a sort key value
+    if (
+        not isinstance(key, str)
+        or isinstance(value, bool) or not isinstance(value, (str, int, float))
+        or isinstance(last_id, bool) or not isinstance(last_id, int)
+    ):
+        raise ValueError("Invalid cursor")
+    return key, value, last_id
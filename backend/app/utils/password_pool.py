@@ -0,0 +1,90 @@
+import asyncio
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from app.config import settings
+from app.utils import security
+from app.utils.exceptions import ServiceUnavailableException
+
+
+class PasswordHasherPool:
+    """Runs bcrypt hashing and verification in a bounded worker process pool
+    
+    bcrypt costs tens of milliseconds of CPU per call. Callers await the
+    result on the event loop, so a login storm holds neither request threads
+    nor database connections while it queues. At most `max_pending` calls are
+    queued or running at once; further callers get a ServiceUnavailableException
+    straight away.
+    """
+    
+    def __init__(
+        self,
+        workers: int = settings.PASSWORD_HASH_WORKERS,
+        max_pending: int = settings.PASSWORD_HASH_MAX_PENDING
+    ):
+        self.workers = workers
+        self.max_pending = max_pending
+        self.in_flight = 0
+        self.completed = 0
+        self.rejected = 0
+        # Never waited on, only tested and taken, so it is not tied to one event loop
+        self._slots = asyncio.Semaphore(max_pending)
+        self._lock = threading.Lock()
+        self._executor = None
+    
+    async def hash_password(self, password: str) -> str:
+        """Hash a password in the pool"""
+        return await self._run(security.hash_password, password)
+    
+    async def verify_password(self, plain_password: str, hashed_password: str) -> bool:
+        """Verify a password against its hash in the pool"""
+        return await self._run(security.verify_password, plain_password, hashed_password)
+    
+    def stats(self) -> dict:
+        """Get concurrency and queue-depth counters"""
+        with self._lock:
+            return {
+                "workers": self.workers,
+                "max_pending": self.max_pending,
+                "in_flight": self.in_flight,
+                "completed": self.completed,
+                "rejected": self.rejected,
+            }
+    
+    def shutdown(self) -> None:
+        """Stop the worker processes"""
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True)
+    
+    async def _run(self, fn, *args):
+        if self._slots.locked():
+            with self._lock:
+                self.rejected += 1
+            raise ServiceUnavailableException("Password hashing is overloaded, please retry")
+        
+        async with self._slots:
+            with self._lock:
+                self.in_flight += 1
+            try:
+                # With no worker processes, hash on the default thread pool instead
+                executor = self._get_executor() if self.workers > 0 else None
+                return await asyncio.get_running_loop().run_in_executor(executor, fn, *args)
+            finally:
+                with self._lock:
+                    self.in_flight -= 1
+                    self.completed += 1
+    
+    def _get_executor(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                # spawn, not fork: the server process is multi-threaded
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    mp_context=multiprocessing.get_context("spawn")
+                )
+            return self._executor
+
+
+password_hasher = PasswordHasherPool()
@@ -0,0 +1,41 @@
+import json
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Any
+from fastapi.responses import Response
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson is optional
+    orjson = None
+
+
+def _default(value: Any) -> Any:
+    """Encode the non-JSON types that come out of database rows"""
+    if isinstance(value, Decimal):
+        return float(value)
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+if orjson is not None:
+    def dumps(value: Any) -> bytes:
+        """Serialize to compact JSON bytes"""
+        return orjson.dumps(value, default=_default)
+else:
+    def dumps(value: Any) -> bytes:
+        """Serialize to compact JSON bytes"""
+        return json.dumps(value, default=_default, separators=(",", ":")).encode()
+
+
+class FastJSONResponse(Response):
+    """JSON response for plain dicts/lists of row values
+    
+    Skips jsonable_encoder and response_model validation, so callers must pass
+    data that is already in its response shape.
+    """
+    media_type = "application/json"
+    
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
@@ -0,0 +1,80 @@
+import asyncio
+import threading
+from concurrent.futures import Future
+from typing import Any, Awaitable, Callable, Dict, Hashable, Tuple
+
+
+class SingleFlight:
+    """Collapses concurrent calls for the same key into one execution
+    
+    The first caller for a key runs the function; callers that arrive while
+    it is running wait for it and share its result (or its exception).
+    """
+    
+    def __init__(self):
+        self.calls = 0
+        self.executions = 0
+        self.collapsed = 0
+        self._flights: Dict[Hashable, Future] = {}
+        self._lock = threading.Lock()
+    
+    def do(self, key: Hashable, fn: Callable[[], Any]) -> Any:
+        """Run fn for key, or wait for the run already in flight"""
+        future, leader = self._join(key)
+        if not leader:
+            return future.result()
+        
+        try:
+            result = fn()
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            self._land(key)
+    
+    async def do_async(self, key: Hashable, fn: Callable[[], Awaitable]) -> Any:
+        """Await fn() for key, or the run already in flight, sync or async, without blocking the loop"""
+        future, leader = self._join(key)
+        if not leader:
+            return await asyncio.wrap_future(future)
+        
+        try:
+            result = await fn()
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            self._land(key)
+    
+    def _join(self, key: Hashable) -> Tuple[Future, bool]:
+        """Get the flight for key and whether this caller leads it"""
+        with self._lock:
+            self.calls += 1
+            future = self._flights.get(key)
+            leader = future is None
+            if leader:
+                future = self._flights[key] = Future()
+                self.executions += 1
+            else:
+                self.collapsed += 1
+            return future, leader
+    
+    def _land(self, key: Hashable) -> None:
+        with self._lock:
+            del self._flights[key]
+    
+    def stats(self) -> dict:
+        """Get call counters and the number of flights in progress"""
+        with self._lock:
+            return {
+                "calls": self.calls,
+                "executions": self.executions,
+                "collapsed": self.collapsed,
+                "in_flight": len(self._flights),
+            }
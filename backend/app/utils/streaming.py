@@ -0,0 +1,12 @@
+import zlib
+from typing import Iterable
+
+
+def gzip_stream(chunks: Iterable, level: int = 6) -> Iterable[bytes]:
+    """Gzip a stream of str/bytes chunks on the fly"""
+    compressor = zlib.compressobj(level, zlib.DEFLATED, 31)
+    for chunk in chunks:
+        data = compressor.compress(chunk.encode() if isinstance(chunk, str) else chunk)
+        if data:
+            yield data
+    yield compressor.flush()
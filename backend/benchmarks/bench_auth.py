@@ -0,0 +1,148 @@
+"""
+Benchmark concurrent authenticated requests.
+
+Compares the original `async def get_current_user`, which ran the synchronous
+user lookup on the event loop, with the current threadpool dependency.
+
+Run from the backend directory:
+    python -m benchmarks.bench_auth --requests 2000 --concurrency 100
+
+`--db-latency-ms` adds a simulated round trip to every query, the way a
+networked database would; with in-process SQLite lookups take microseconds
+and the threadpool hop dominates.
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import httpx
+from fastapi import Depends, HTTPException, status
+from fastapi.security import HTTPAuthorizationCredentials
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import Session, sessionmaker
+
+from app.api import deps
+from app.database import Base, get_db, get_read_db
+from app.main import app
+from app.models.user import User
+from app.repositories.user_repository import UserRepository, principal_cache
+from app.utils.security import create_access_token, decode_token
+
+
+async def legacy_get_current_user(
+    credentials: HTTPAuthorizationCredentials = Depends(deps.security),
+    db: Session = Depends(get_db)
+):
+    """The original dependency: blocking DB call inside `async def`
+    
+    Like the current one it releases its connection after the lookup, so the
+    two differ only in where the query runs.
+    """
+    payload = decode_token(credentials.credentials)
+    try:
+        user = UserRepository(db).get_by_username(payload.get("sub"))
+    finally:
+        db.close()
+    if user is None:
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED)
+    return user
+
+
+def percentile(samples, pct):
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+
+async def run(total: int, concurrency: int, token: str) -> list:
+    latencies = []
+    semaphore = asyncio.Semaphore(concurrency)
+    transport = httpx.ASGITransport(app=app)
+    
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        async def one():
+            async with semaphore:
+                start = time.perf_counter()
+                response = await client.get(
+                    "/api/v1/inventory/purchases",
+                    headers={"Authorization": f"Bearer {token}"}
+                )
+                latencies.append(time.perf_counter() - start)
+                assert response.status_code == 200, response.text
+        
+        await asyncio.gather(*(one() for _ in range(total)))
+    return latencies
+
+
+def report(label: str, latencies: list, elapsed: float) -> None:
+    ms = [latency * 1000 for latency in latencies]
+    print(
+        f"{label:<28} {len(ms) / elapsed:>8.0f} req/s"
+        f"  p50 {statistics.median(ms):>7.2f} ms"
+        f"  p99 {percentile(ms, 99):>7.2f} ms"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=100)
+    parser.add_argument("--db-latency-ms", type=float, default=0.0)
+    args = parser.parse_args()
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_engine(
+            f"sqlite:///{os.path.join(tmp, 'bench.db')}",
+            connect_args={"check_same_thread": False},
+            # One connection per concurrent request: with a smaller pool the
+            # blocking variant deadlocks the event loop waiting for a checkout
+            pool_size=args.concurrency
+        )
+        Base.metadata.create_all(bind=engine)
+        
+        if args.db_latency_ms:
+            @event.listens_for(engine, "before_cursor_execute")
+            def simulate_round_trip(*_):
+                time.sleep(args.db_latency_ms / 1000)
+        
+        BenchSession = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+        
+        with BenchSession() as db:
+            db.add(User(username="bench", email="bench@example.com", hashed_password="x"))
+            db.commit()
+        token = create_access_token(data={"sub": "bench"})
+        
+        def bench_get_db():
+            db = BenchSession()
+            try:
+                yield db
+            finally:
+                db.close()
+        
+        app.dependency_overrides[get_db] = bench_get_db
+        app.dependency_overrides[get_read_db] = bench_get_db
+        # Measure the lookup itself: with the principal cache on, the current
+        # dependency would skip the database after the first request
+        principal_cache.maxsize = 0
+        for label, override in [
+            ("before (async, blocking)", legacy_get_current_user),
+            ("after (threadpool)", None),
+        ]:
+            app.dependency_overrides.pop(deps.get_current_user, None)
+            if override is not None:
+                app.dependency_overrides[deps.get_current_user] = override
+            start = time.perf_counter()
+            latencies = asyncio.run(run(args.requests, args.concurrency, token))
+            report(label, latencies, time.perf_counter() - start)
+        
+        app.dependency_overrides.clear()
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+"""
+Benchmark JSON serialization of large sweet list responses.
+
+Compares, for a list of --rows sweets read from a SQLite file:
+  pydantic  ORM objects -> List[Sweet] validation -> jsonable_encoder -> json
+            (what a response_model endpoint does)
+  fast      column tuples -> dicts -> app.utils.serialization.dumps
+  endpoint  GET /api/v1/sweets/?limit=N end to end through the ASGI app
+
+Run from the backend directory:
+    python -m benchmarks.bench_serialization --rows 10000 --repeat 5
+"""
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+from typing import List
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.testclient import TestClient
+from pydantic import TypeAdapter
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.database import Base, get_read_db
+from app.main import app
+from app.models.sweet import Sweet
+from app.repositories.sweet_repository import SweetRepository, SWEET_COLUMNS
+from app.schemas.sweet import Sweet as SweetSchema
+from app.services.sweet_service import catalog_cache
+from app.utils.serialization import dumps, orjson
+
+
+def setup(path: str, rows: int):
+    engine = create_engine(f"sqlite:///{path}", connect_args={"check_same_thread": False})
+    Base.metadata.create_all(bind=engine)
+    Session = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    
+    with Session() as db:
+        db.add_all(
+            Sweet(
+                name=f"Sweet {i}",
+                category=f"Category {i % 10}",
+                price=1.25 + i % 100,
+                quantity=i,
+                description="A very sweet sweet"
+            )
+            for i in range(rows)
+        )
+        db.commit()
+    return engine, Session
+
+
+def pydantic_path(Session, rows: int) -> bytes:
+    adapter = TypeAdapter(List[SweetSchema])
+    with Session() as db:
+        sweets = SweetRepository(db).get_all(limit=rows)
+        value = adapter.validate_python(sweets, from_attributes=True)
+        return json.dumps(jsonable_encoder(value), separators=(",", ":")).encode()
+
+
+def fast_path(Session, rows: int) -> bytes:
+    with Session() as db:
+        sweets = SweetRepository(db).get_all(limit=rows, columns=SWEET_COLUMNS)
+        return dumps([row._asdict() for row in sweets])
+
+
+def endpoint_path(client: TestClient, rows: int) -> bytes:
+    catalog_cache.clear()
+    return client.get("/api/v1/sweets/", params={"limit": rows}).content
+
+
+def timed(name: str, fn, rows: int, repeat: int) -> bytes:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        body = fn()
+        best = min(best, time.perf_counter() - start)
+    print(f"{name:<10} {best * 1000:>8.1f} ms   {rows / best:>10.0f} rows/s   {len(body):>9} bytes")
+    return body
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, default=10000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        engine, Session = setup(os.path.join(tmp, "bench.db"), args.rows)
+        
+        def override_get_db():
+            with Session() as db:
+                yield db
+        
+        app.dependency_overrides[get_read_db] = override_get_db
+        
+        print(f"serializer: {'orjson' if orjson else 'json (orjson not installed)'}")
+        slow = timed("pydantic", lambda: pydantic_path(Session, args.rows), args.rows, args.repeat)
+        fast = timed("fast", lambda: fast_path(Session, args.rows), args.rows, args.repeat)
+        with TestClient(app) as client:
+            timed("endpoint", lambda: endpoint_path(client, args.rows), args.rows, args.repeat)
+        
+        assert json.loads(slow) == json.loads(fast), "fast path output differs"
+        app.dependency_overrides.clear()
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,131 @@
+"""
+Benchmark SQLite storage profiles on the purchase and catalog workloads.
+
+Every profile in app.database.SQLITE_PROFILES gets a fresh database file:
+  purchase  concurrent threads buying random sweets through InventoryService
+  catalog   reader threads listing sweets while one thread keeps purchasing
+
+Run from the backend directory:
+    python -m benchmarks.bench_storage --seconds 3 --threads 8
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import create_engine
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import sessionmaker
+
+from app.database import Base, SQLITE_PROFILES, configure_sqlite
+from app.models.sweet import Sweet
+from app.models.user import User
+from app.repositories.sweet_repository import SweetRepository
+from app.services.inventory_service import InventoryService
+
+SWEETS = 500
+
+
+def setup(path: str, profile: str, threads: int):
+    engine = create_engine(
+        f"sqlite:///{path}",
+        connect_args={"check_same_thread": False},
+        pool_size=threads + 1
+    )
+    configure_sqlite(engine, SQLITE_PROFILES[profile])
+    Base.metadata.create_all(bind=engine)
+    Session = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    
+    with Session() as db:
+        db.add(User(username="bench", email="bench@example.com", hashed_password="x"))
+        db.add_all(
+            Sweet(name=f"Sweet {i}", category=f"Category {i % 10}", price=1.5, quantity=10 ** 9)
+            for i in range(SWEETS)
+        )
+        db.commit()
+    return engine, Session
+
+
+def run_threads(workers, seconds: float) -> None:
+    stop = time.monotonic() + seconds
+    threads = [threading.Thread(target=worker, args=(stop,)) for worker in workers]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+
+def purchaser(Session, counts: dict, lock: threading.Lock):
+    def work(stop: float):
+        done = locked = 0
+        with Session() as db:
+            inventory_service = InventoryService(db)
+            while time.monotonic() < stop:
+                try:
+                    inventory_service.purchase_sweet(1, random.randint(1, SWEETS), 1)
+                    done += 1
+                except OperationalError:
+                    db.rollback()
+                    locked += 1
+        with lock:
+            counts["writes"] += done
+            counts["errors"] += locked
+    return work
+
+
+def reader(Session, counts: dict, lock: threading.Lock):
+    def work(stop: float):
+        done = 0
+        with Session() as db:
+            sweet_repo = SweetRepository(db)
+            while time.monotonic() < stop:
+                sweet_repo.get_all(skip=random.randint(0, SWEETS - 100), limit=100)
+                db.rollback()
+                done += 1
+        with lock:
+            counts["reads"] += done
+    return work
+
+
+def bench(profile: str, seconds: float, threads: int) -> None:
+    with tempfile.TemporaryDirectory() as tmp:
+        engine, Session = setup(os.path.join(tmp, "bench.db"), profile, threads)
+        lock = threading.Lock()
+        
+        purchase = {"writes": 0, "errors": 0, "reads": 0}
+        run_threads([purchaser(Session, purchase, lock) for _ in range(threads)], seconds)
+        
+        catalog = {"writes": 0, "errors": 0, "reads": 0}
+        run_threads(
+            [purchaser(Session, catalog, lock)]
+            + [reader(Session, catalog, lock) for _ in range(threads - 1)],
+            seconds
+        )
+        engine.dispose()
+    
+    print(
+        f"{profile:<10}"
+        f" purchase {purchase['writes'] / seconds:>8.0f} tx/s ({purchase['errors']} locked)"
+        f"   catalog {catalog['reads'] / seconds:>8.0f} reads/s"
+        f" + {catalog['writes'] / seconds:>6.0f} tx/s ({catalog['errors']} locked)"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--seconds", type=float, default=3.0)
+    parser.add_argument("--threads", type=int, default=8)
+    parser.add_argument("--profiles", nargs="*", default=list(SQLITE_PROFILES))
+    args = parser.parse_args()
+    
+    for profile in args.profiles:
+        bench(profile, args.seconds, args.threads)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+"""
+Bulk import sweets from a CSV or NDJSON file.
+
+Rows are upserted in batches: a row with an id updates that sweet, a row
+without one updates the sweet with the same name or creates a new one.
+
+Usage:
+    python import_catalog.py catalog.csv
+    python import_catalog.py catalog.ndjson --batch-size 5000
+"""
+import argparse
+import sys
+import os
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from app.config import settings
+from app.database import SessionLocal
+from app.services.catalog_import_service import CatalogImportService, iter_csv_rows, iter_ndjson_rows
+
+
+def import_catalog(path: str, file_format: str, batch_size: int):
+    """Import a catalog file and print the report"""
+    db = SessionLocal()
+    start = time.perf_counter()
+    
+    try:
+        with open(path, encoding="utf-8-sig", newline="") as f:
+            rows = iter_csv_rows(f) if file_format == "csv" else iter_ndjson_rows(f)
+            report = CatalogImportService(db).import_rows(rows, batch_size)
+    finally:
+        db.close()
+    
+    elapsed = time.perf_counter() - start
+    imported = report["inserted"] + report["updated"]
+    print(f"✓ Imported {imported} sweet(s) in {elapsed:.1f}s ({imported / max(elapsed, 1e-9):.0f} rows/s)")
+    print(f"  Inserted: {report['inserted']}")
+    print(f"  Updated:  {report['updated']}")
+    print(f"  Failed:   {report['failed']}")
+    for error in report["errors"][:20]:
+        print(f"  ✗ line {error['line']}: {error['error']}")
+    
+    return report
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Bulk import sweets from CSV or NDJSON")
+    parser.add_argument("path")
+    parser.add_argument("--format", choices=["csv", "ndjson"])
+    parser.add_argument("--batch-size", type=int, default=settings.IMPORT_BATCH_SIZE)
+    args = parser.parse_args()
+    
+    file_format = args.format or ("csv" if args.path.lower().endswith(".csv") else "ndjson")
+    report = import_catalog(args.path, file_format, args.batch_size)
+    sys.exit(1 if report["failed"] else 0)
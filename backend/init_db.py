@@ -5,6 +5,7 @@ Run this before starting the application for the first time.
 import sqlite3
 from pathlib import Path
 from app.database import Base, engine
+from app.models.sweet import create_search_index
 
 # SQL schema file path
 SCHEMA_SQL = """
@@ -77,9 +78,8 @@ def init_db():
     # Create all tables using SQLAlchemy ORM
     Base.metadata.create_all(bind=engine)
     
-    # Additional SQL initialization
-    db_url = "sqlite:///./sweet_shop.db"
-    db_path = Path(db_url.replace("sqlite:///", ""))
+    # Additional SQL initialization, on the same file as the engine
+    db_path = Path(engine.url.database)
     
     try:
         conn = sqlite3.connect(str(db_path))
@@ -92,6 +92,11 @@ def init_db():
         
         conn.commit()
         conn.close()
+        
+        # Full-text search index for /sweets/search
+        with engine.begin() as connection:
+            create_search_index(connection)
+        
         print("✓ Database initialized successfully!")
         print(f"✓ Database file: {db_path.absolute()}")
         
@@ -24,15 +24,46 @@ def override_get_db():
         db.close()
 
 
-from app.database import get_db
+from app.database import get_catalog_db, get_db, get_read_db
 app.dependency_overrides[get_db] = override_get_db
+app.dependency_overrides[get_read_db] = override_get_db
+app.dependency_overrides[get_catalog_db] = override_get_db
 
 
 @pytest.fixture(scope="function")
 def db():
     Base.metadata.create_all(bind=engine)
-    yield TestingSessionLocal()
+    session = TestingSessionLocal()
+    yield session
+    session.close()
     Base.metadata.drop_all(bind=engine)
+    # Leave empty tables behind for tests that only use the client
+    Base.metadata.create_all(bind=engine)
+
+
+@pytest.fixture(scope="function")
+async def async_db():
+    from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
+    from sqlalchemy.pool import StaticPool
+    
+    async_engine = create_async_engine("sqlite+aiosqlite://", poolclass=StaticPool)
+    async with async_engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    
+    async with async_sessionmaker(async_engine, expire_on_commit=False)() as session:
+        yield session
+    await async_engine.dispose()
+
+
+@pytest.fixture(autouse=True)
+def clear_caches():
+    from app.services.sweet_service import catalog_cache
+    from app.repositories.user_repository import principal_cache
+    catalog_cache.clear()
+    principal_cache.clear()
+    yield
+    catalog_cache.clear()
+    principal_cache.clear()
 
 
 @pytest.fixture(scope="function")
@@ -52,3 +52,67 @@ def test_login_invalid_credentials(client):
         }
     )
     assert response.status_code == 401
+
+
+def test_principal_cache_invalidated_on_update(client):
+    """Test a deactivated user is rejected despite a cached principal"""
+    from app.repositories.user_repository import UserRepository, principal_cache
+    from tests.conftest import TestingSessionLocal
+    
+    user_data = {"username": "cacheduser", "email": "cached@example.com", "password": "TestPassword123"}
+    token = client.post("/api/v1/auth/register", json=user_data).json()["access_token"]
+    headers = {"Authorization": f"Bearer {token}"}
+    
+    assert client.get("/api/v1/inventory/purchases", headers=headers).status_code == 200
+    assert principal_cache.get("cacheduser") is not None
+    
+    with TestingSessionLocal() as db:
+        user_repo = UserRepository(db)
+        user_repo.update(user_repo.get_by_username("cacheduser"), {"is_active": False})
+    
+    assert client.get("/api/v1/inventory/purchases", headers=headers).status_code == 403
+
+
+def test_current_user_releases_connection(db):
+    """Test the auth dependency gives its connection back after looking up the user"""
+    from fastapi.security import HTTPAuthorizationCredentials
+    from app.api.deps import get_current_user
+    from app.repositories.user_repository import UserRepository
+    from app.utils.security import create_access_token
+    
+    UserRepository(db).create(username="streamer", email="streamer@example.com", hashed_password="x")
+    credentials = HTTPAuthorizationCredentials(
+        scheme="Bearer",
+        credentials=create_access_token(data={"sub": "streamer"})
+    )
+    
+    user = get_current_user(credentials, db)
+    
+    assert user.username == "streamer"
+    assert not db.in_transaction()
+
+
+def test_principal_cache_skips_load_overlapping_update(db, monkeypatch):
+    """Test a principal loaded while the user is being deactivated is not cached"""
+    from fastapi.security import HTTPAuthorizationCredentials
+    from app.api.deps import get_current_user
+    from app.repositories.user_repository import UserRepository, principal_cache
+    from app.utils.security import create_access_token
+    from tests.conftest import TestingSessionLocal
+    
+    UserRepository(db).create(username="racer", email="racer@example.com", hashed_password="x")
+    get_by_username = UserRepository.get_by_username
+    
+    def lookup_then_deactivate(self, username):
+        # The write lands after the lookup read the still-active row
+        user = get_by_username(self, username)
+        with TestingSessionLocal() as other:
+            other_repo = UserRepository(other)
+            other_repo.update(get_by_username(other_repo, username), {"is_active": False})
+        return user
+    
+    monkeypatch.setattr(UserRepository, "get_by_username", lookup_then_deactivate)
+    credentials = HTTPAuthorizationCredentials(scheme="Bearer", credentials=create_access_token(data={"sub": "racer"}))
+    get_current_user(credentials, TestingSessionLocal())
+    
+    assert principal_cache.get("racer") is None
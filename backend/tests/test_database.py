@@ -0,0 +1,125 @@
+import pytest
+
+
+def test_read_engine_is_read_only(tmp_path):
+    """Test the read engine sees committed data but cannot write"""
+    from sqlalchemy import create_engine, text
+    from sqlalchemy.exc import OperationalError
+    from app.database import create_read_engine, SQLITE_PROFILES
+    
+    url = f"sqlite:///{tmp_path / 'shop.db'}"
+    write_engine = create_engine(url)
+    with write_engine.begin() as conn:
+        conn.execute(text("PRAGMA journal_mode=WAL"))
+        conn.execute(text("CREATE TABLE t (x INTEGER)"))
+        conn.execute(text("INSERT INTO t VALUES (1)"))
+    
+    read_engine = create_read_engine(url, SQLITE_PROFILES["balanced"])
+    with read_engine.connect() as conn:
+        assert conn.execute(text("SELECT x FROM t")).scalar() == 1
+        with pytest.raises(OperationalError):
+            conn.execute(text("INSERT INTO t VALUES (2)"))
+    
+    read_engine.dispose()
+    write_engine.dispose()
+
+
+def test_read_engine_skipped_for_memory_databases():
+    """Test in-memory databases fall back to the write engine"""
+    from app.database import create_read_engine
+    
+    assert create_read_engine("sqlite://", {}) is None
+    assert create_read_engine("sqlite:///:memory:", {}) is None
+
+
+def upgrade_to_head(path, monkeypatch):
+    """Run `alembic upgrade head` against a SQLite file"""
+    import os
+    from alembic import command
+    from alembic.config import Config
+    from app.config import settings
+    
+    # env.py takes the URL from settings; no config file keeps logging untouched
+    monkeypatch.setattr(settings, "DATABASE_URL", f"sqlite:///{path}")
+    config = Config()
+    config.set_main_option(
+        "script_location",
+        os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "alembic")
+    )
+    command.upgrade(config, "head")
+
+
+def test_migrations_create_search_index(tmp_path, monkeypatch):
+    """Test a pre-migration database can search sweets after alembic upgrade head"""
+    import sqlite3
+    from sqlalchemy import create_engine
+    from sqlalchemy.orm import Session
+    from app.repositories.sweet_repository import SweetRepository
+    from init_db import SCHEMA_SQL
+    
+    path = tmp_path / "shop.db"
+    conn = sqlite3.connect(path)
+    conn.executescript(SCHEMA_SQL)
+    conn.execute("INSERT INTO sweets (name, category, price, quantity) VALUES ('Chocolate Fudge', 'Fudge', 3.5, 4)")
+    conn.commit()
+    conn.close()
+    
+    upgrade_to_head(path, monkeypatch)
+    
+    engine = create_engine(f"sqlite:///{path}")
+    with Session(engine) as db:
+        sweet_repo = SweetRepository(db)
+        assert [sweet.name for sweet in sweet_repo.search("choc")] == ["Chocolate Fudge"]
+        
+        sweet_repo.create(name="Chocolate Bar", price=1.99, category="Chocolates")
+        assert len(sweet_repo.search("choc")) == 2
+    engine.dispose()
+
+
+async def test_async_session_round_trip(async_db):
+    """Test the opt-in asyncio engine plumbing reads and writes the ORM models"""
+    from sqlalchemy import select
+    from app.database import async_database_url
+    from app.models.sweet import Sweet
+    
+    assert async_database_url("sqlite:///./shop.db") == "sqlite+aiosqlite:///./shop.db"
+    
+    async_db.add(Sweet(name="Test Sweet", price=5.99, quantity=10, category="Candy"))
+    await async_db.commit()
+    
+    assert await async_db.scalar(select(Sweet.name)) == "Test Sweet"
+
+
+def test_default_sqlite_profile_is_durable():
+    """Test commits are fully synced unless a faster profile is opted into"""
+    from app.config import Settings
+    from app.database import SQLITE_PROFILES
+    
+    assert Settings.model_fields["SQLITE_PROFILE"].default == "durable"
+    assert SQLITE_PROFILES["durable"]["synchronous"] == "FULL"
+
+
+def test_migrations_upgrade_init_db_database(tmp_path, monkeypatch):
+    """Test a database built by init_db.py upgrades to head without errors"""
+    import init_db
+    from sqlalchemy import create_engine, text
+    
+    path = tmp_path / "shop.db"
+    engine = create_engine(f"sqlite:///{path}")
+    monkeypatch.setattr(init_db, "engine", engine)
+    init_db.init_db()
+    with engine.begin() as conn:
+        conn.execute(text(
+            "INSERT INTO sweets (name, category, price, quantity, created_at, updated_at) "
+            "VALUES ('Laddu', 'Balls', 1.0, 5, CURRENT_TIMESTAMP, CURRENT_TIMESTAMP)"
+        ))
+    
+    upgrade_to_head(path, monkeypatch)
+    upgrade_to_head(path, monkeypatch)
+    
+    with engine.begin() as conn:
+        assert conn.execute(text("SELECT version FROM catalog_version")).scalar() == 1
+        conn.execute(text("UPDATE sweets SET quantity = 4"))
+        assert conn.execute(text("SELECT version FROM sweets")).scalar() == 2
+        assert conn.execute(text("SELECT COUNT(*) FROM catalog_version")).scalar() == 1
+    engine.dispose()
@@ -23,3 +23,50 @@ def test_get_inventory_history_unauthorized(client):
     """Test getting inventory history without authentication"""
     response = client.get("/api/v1/inventory/history/1")
     assert response.status_code == 403
+
+
+def test_checkout_unauthorized(client):
+    """Test checking out without authentication"""
+    response = client.post(
+        "/api/v1/inventory/checkout",
+        json={"items": [{"sweet_id": 1, "quantity": 2}]}
+    )
+    assert response.status_code == 403
+
+
+def test_get_user_purchases_paginated(client, db):
+    """Test purchases come back newest first across cursor pages"""
+    from datetime import datetime, timedelta
+    from app.models.purchase import PurchaseHistory
+    from app.repositories.sweet_repository import SweetRepository
+    from app.repositories.user_repository import UserRepository
+    from app.utils.security import create_access_token
+    
+    user = UserRepository(db).create(username="buyer", email="buyer@example.com", hashed_password="x")
+    sweet = SweetRepository(db).create(name="Barfi", price=2.0, category="Indian")
+    start = datetime(2026, 1, 1)
+    db.add_all(
+        PurchaseHistory(user_id=user.id, sweet_id=sweet.id, quantity=1, total_price=2.0,
+                        purchase_date=start + timedelta(days=i % 3))
+        for i in range(5)
+    )
+    db.commit()
+    headers = {"Authorization": f"Bearer {create_access_token(data={'sub': 'buyer'})}"}
+    
+    seen = []
+    params = {"limit": 2}
+    while True:
+        body = client.get("/api/v1/inventory/purchases", params=params, headers=headers).json()
+        seen.extend(body["data"])
+        if not body["next_cursor"]:
+            break
+        params = {"limit": 2, "cursor": body["next_cursor"]}
+    
+    assert len({p["id"] for p in seen}) == 5
+    assert [p["purchased_at"] for p in seen] == sorted((p["purchased_at"] for p in seen), reverse=True)
+    assert all(p["sweet_name"] == "Barfi" for p in seen)
+    
+    from app.utils.pagination import encode_cursor
+    cursor = encode_cursor("purchase_date", 5, 1)
+    response = client.get("/api/v1/inventory/purchases", params={"cursor": cursor}, headers=headers)
+    assert response.status_code == 400
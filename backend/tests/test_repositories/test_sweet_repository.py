@@ -30,3 +30,29 @@ def test_sweet_repository_get_by_id(db):
     sweet = sweet_repo.get_by_id(created_sweet.id)
     assert sweet is not None
     assert sweet.name == "Test Sweet"
+
+
+async def test_async_sweet_repository(async_db):
+    """Test the async repository creates, searches, pages, patches and takes stock"""
+    from app.repositories.sweet_repository import AsyncSweetRepository, SWEET_FIELDS
+    
+    sweet_repo = AsyncSweetRepository(async_db)
+    sweet = await sweet_repo.create(name="Test Sweet", price=5.99, quantity=10, category="Candy")
+    other = await sweet_repo.create(name="Other Sweet", price=1.50, quantity=3, category="Cakes")
+    
+    assert (await sweet_repo.get_by_id(sweet.id)).name == "Test Sweet"
+    assert [s.id for s in await sweet_repo.search("test")] == [sweet.id]
+    assert (await sweet_repo.get_row(other.id, [SWEET_FIELDS["name"]])).name == "Other Sweet"
+    
+    rows = await sweet_repo.get_page(1, order_by="price", columns=[SWEET_FIELDS["id"], SWEET_FIELDS["price"]])
+    assert [row._asdict() for row in rows] == [{"id": other.id, "price": 1.5}]
+    assert await sweet_repo.get_catalog_version() == 2
+    
+    assert await sweet_repo.update_where({"category": "Sweets"}, ids=[]) == 0
+    assert await sweet_repo.update_many([{"id": other.id, "quantity": 4}, {"id": 999, "quantity": 1}]) == [999]
+    
+    assert await sweet_repo.decrement_stock(sweet.id, 4) is not None
+    assert await sweet_repo.decrement_stock(sweet.id, 7) is None
+    await async_db.commit()
+    
+    assert await sweet_repo.get_quantities([sweet.id, other.id]) == {sweet.id: 6, other.id: 4}
@@ -30,3 +30,19 @@ def test_user_repository_get_by_username(db):
     user = user_repo.get_by_username("testuser")
     assert user is not None
     assert user.username == "testuser"
+
+
+async def test_async_user_repository(async_db):
+    """Test the async repository creates and looks up users"""
+    from app.repositories.user_repository import AsyncUserRepository
+    
+    user_repo = AsyncUserRepository(async_db)
+    user = await user_repo.create(
+        username="testuser",
+        email="test@example.com",
+        hashed_password="hashedpassword"
+    )
+    
+    assert user.id is not None
+    assert (await user_repo.get_by_username("testuser")).id == user.id
+    assert await user_repo.get_by_email("missing@example.com") is None
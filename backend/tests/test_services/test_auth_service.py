@@ -1,27 +1,57 @@
 import pytest
 
 
-def test_auth_service_register(db, test_user_data):
+async def test_auth_service_register(db, test_user_data):
     """Test auth service registration"""
     from app.services.auth_service import AuthService
     
     auth_service = AuthService(db)
-    token = auth_service.register(test_user_data)
+    token = await auth_service.register(test_user_data)
     
     assert token is not None
     assert token.access_token
     assert token.token_type == "bearer"
 
 
-def test_auth_service_login(db, test_user_data):
+async def test_auth_service_login(db, test_user_data):
     """Test auth service login"""
     from app.services.auth_service import AuthService
     
     auth_service = AuthService(db)
     # Register first
-    auth_service.register(test_user_data)
+    await auth_service.register(test_user_data)
     
     # Login
-    token = auth_service.login(test_user_data["username"], test_user_data["password"])
+    token = await auth_service.login(test_user_data["username"], test_user_data["password"])
     assert token is not None
     assert token.access_token
+
+
+async def test_password_hasher_pool():
+    """Test hashing round-trips through worker processes"""
+    from app.utils.password_pool import PasswordHasherPool
+    
+    pool = PasswordHasherPool(workers=1, max_pending=2)
+    try:
+        hashed = await pool.hash_password("TestPassword123")
+        assert await pool.verify_password("TestPassword123", hashed)
+        assert not await pool.verify_password("wrong", hashed)
+        assert pool.stats()["completed"] == 3
+    finally:
+        pool.shutdown()
+
+
+async def test_password_hasher_pool_rejects_when_saturated():
+    """Test callers are turned away at once when every slot is taken"""
+    from app.utils.password_pool import PasswordHasherPool
+    from app.utils.exceptions import ServiceUnavailableException
+    
+    pool = PasswordHasherPool(workers=0, max_pending=1)
+    await pool._slots.acquire()
+    
+    with pytest.raises(ServiceUnavailableException):
+        await pool.hash_password("TestPassword123")
+    assert pool.stats()["rejected"] == 1
+    
+    pool._slots.release()
+    assert await pool.hash_password("TestPassword123")
@@ -20,3 +20,270 @@ def test_restock_sweet(db, test_sweet_data):
     assert log is not None
     assert log.action == "RESTOCK"
     assert log.quantity_change == 5
+
+
+def test_purchase_sweet(db, test_sweet_data):
+    """Test a purchase decrements stock and records purchase and log rows"""
+    from app.services.sweet_service import SweetService
+    from app.services.inventory_service import InventoryService
+    from app.schemas.sweet import SweetCreate
+    from app.models.inventory_log import InventoryLog
+    
+    sweet = SweetService(db).create_sweet(SweetCreate(**test_sweet_data))
+    inventory_service = InventoryService(db)
+    
+    purchase = inventory_service.purchase_sweet(user_id=1, sweet_id=sweet.id, quantity=4)
+    
+    assert purchase.id is not None
+    assert float(purchase.total_price) == pytest.approx(4 * 5.99)
+    assert inventory_service.sweet_repo.get_by_id(sweet.id).quantity == 6
+    assert db.query(InventoryLog).filter(InventoryLog.action == "PURCHASE").count() == 1
+
+
+def test_purchase_sweet_insufficient_stock(db, test_sweet_data):
+    """Test a purchase larger than the stock leaves nothing behind"""
+    from app.services.sweet_service import SweetService
+    from app.services.inventory_service import InventoryService
+    from app.schemas.sweet import SweetCreate
+    from app.models.purchase import PurchaseHistory
+    
+    sweet = SweetService(db).create_sweet(SweetCreate(**test_sweet_data))
+    inventory_service = InventoryService(db)
+    
+    with pytest.raises(ValueError, match="Insufficient stock"):
+        inventory_service.purchase_sweet(user_id=1, sweet_id=sweet.id, quantity=11)
+    
+    with pytest.raises(ValueError, match="Sweet not found"):
+        inventory_service.purchase_sweet(user_id=1, sweet_id=999, quantity=1)
+    
+    assert inventory_service.sweet_repo.get_by_id(sweet.id).quantity == 10
+    assert db.query(PurchaseHistory).count() == 0
+
+
+def test_checkout(db, test_sweet_data):
+    """Test a multi-item checkout purchases every line"""
+    from app.services.sweet_service import SweetService
+    from app.services.inventory_service import InventoryService
+    from app.schemas.sweet import SweetCreate
+    from app.models.inventory_log import InventoryLog
+    
+    sweet_service = SweetService(db)
+    cake = sweet_service.create_sweet(SweetCreate(**test_sweet_data))
+    bar = sweet_service.create_sweet(SweetCreate(**{**test_sweet_data, "name": "Bar", "price": 1.0}))
+    inventory_service = InventoryService(db)
+    
+    purchases = inventory_service.checkout(user_id=1, items=[
+        {"sweet_id": cake.id, "quantity": 2},
+        {"sweet_id": bar.id, "quantity": 3},
+        {"sweet_id": cake.id, "quantity": 1},
+    ])
+    
+    assert sorted((p.sweet_id, p.quantity) for p in purchases) == [(cake.id, 3), (bar.id, 3)]
+    assert inventory_service.sweet_repo.get_by_id(cake.id).quantity == 7
+    assert inventory_service.sweet_repo.get_by_id(bar.id).quantity == 7
+    assert db.query(InventoryLog).count() == 2
+
+
+def test_checkout_is_all_or_nothing(db, test_sweet_data):
+    """Test a checkout with one unavailable line writes nothing"""
+    from app.services.sweet_service import SweetService
+    from app.services.inventory_service import InventoryService
+    from app.schemas.sweet import SweetCreate
+    from app.models.purchase import PurchaseHistory
+    
+    sweet_service = SweetService(db)
+    cake = sweet_service.create_sweet(SweetCreate(**test_sweet_data))
+    bar = sweet_service.create_sweet(SweetCreate(**{**test_sweet_data, "name": "Bar", "quantity": 1}))
+    inventory_service = InventoryService(db)
+    
+    with pytest.raises(ValueError, match="Insufficient stock"):
+        inventory_service.checkout(user_id=1, items=[
+            {"sweet_id": cake.id, "quantity": 2},
+            {"sweet_id": bar.id, "quantity": 5},
+        ])
+    
+    assert inventory_service.sweet_repo.get_by_id(cake.id).quantity == 10
+    assert db.query(PurchaseHistory).count() == 0
+
+
+def test_bulk_restock(db, test_sweet_data):
+    """Test a delivery manifest restocks valid lines and reports the rest"""
+    from app.services.sweet_service import SweetService
+    from app.services.inventory_service import InventoryService
+    from app.schemas.sweet import SweetCreate
+    from app.models.inventory_log import InventoryLog
+    
+    sweet_service = SweetService(db)
+    cake = sweet_service.create_sweet(SweetCreate(**test_sweet_data))
+    bar = sweet_service.create_sweet(SweetCreate(**{**test_sweet_data, "name": "Bar", "quantity": 0}))
+    inventory_service = InventoryService(db)
+    
+    results = inventory_service.bulk_restock(user_id=1, notes="Truck 7", items=[
+        {"sweet_id": cake.id, "quantity": 5},
+        {"sweet_id": 9999, "quantity": 5},
+        {"sweet_id": bar.id, "quantity": 0},
+        {"sweet_id": bar.id, "quantity": 12, "notes": "Short-dated"},
+        {"sweet_id": cake.id, "quantity": 1},
+    ])
+    
+    assert [result["status"] for result in results] == ["restocked", "error", "error", "restocked", "restocked"]
+    assert results[1]["error"] == "Sweet not found"
+    assert results[0]["new_quantity"] == 16 and results[3]["new_quantity"] == 12
+    logs = db.query(InventoryLog).order_by(InventoryLog.id).all()
+    assert [(log.sweet_id, log.quantity_change, log.notes) for log in logs] == [
+        (cake.id, 5, "Truck 7"), (bar.id, 12, "Short-dated"), (cake.id, 1, "Truck 7")
+    ]
+
+
+async def test_stock_events(db, test_sweet_data):
+    """Test stock changes fan out coalesced per sweet, with resync on overflow"""
+    from app.services.sweet_service import SweetService
+    from app.services.inventory_service import InventoryService
+    from app.services.stock_events import stock_events
+    from app.schemas.sweet import SweetCreate
+    
+    sweet = SweetService(db).create_sweet(SweetCreate(**test_sweet_data))
+    subscription = stock_events.subscribe()
+    try:
+        inventory_service = InventoryService(db)
+        inventory_service.purchase_sweet(user_id=1, sweet_id=sweet.id, quantity=2)
+        inventory_service.restock_sweet(sweet.id, 5, user_id=1)
+        with pytest.raises(ValueError):
+            inventory_service.purchase_sweet(user_id=1, sweet_id=sweet.id, quantity=100)
+        
+        assert await subscription.wait(1)
+        assert subscription.drain() == ({sweet.id: 13}, False)
+        
+        stock_events.publish({sweet_id: 1 for sweet_id in range(subscription.max_pending + 1)})
+        assert subscription.drain() == ({}, True)
+    finally:
+        stock_events.unsubscribe(subscription)
+
+
+def test_group_commit_writer(db, test_sweet_data):
+    """Test batched purchases each get their own result or error"""
+    from concurrent.futures import wait
+    from app.services.sweet_service import SweetService
+    from app.services.group_commit import GroupCommitWriter
+    from app.schemas.sweet import SweetCreate
+    from tests.conftest import TestingSessionLocal
+    
+    sweet = SweetService(db).create_sweet(SweetCreate(**test_sweet_data))
+    writer = GroupCommitWriter(session_factory=TestingSessionLocal, max_batch=8, max_delay_ms=50)
+    
+    futures = [
+        writer.submit("purchase", user_id=1, sweet_id=sweet.id, quantity=4)
+        for _ in range(3)
+    ]
+    futures.append(writer.submit("restock", sweet_id=sweet.id, quantity=5, user_id=1))
+    futures.append(writer.submit("restock", sweet_id=sweet.id, quantity=-100, user_id=1))
+    wait(futures)
+    writer.stop()
+    
+    errors = [f.exception() for f in futures[:3] if f.exception()]
+    assert len(errors) == 1 and "Insufficient stock" in str(errors[0])
+    assert futures[3].result().action == "RESTOCK"
+    assert "Quantity must be positive" in str(futures[4].exception())
+    db.expire_all()
+    assert SweetService(db).sweet_repo.get_by_id(sweet.id).quantity == 7
+    
+    from app.services.inventory_service import InventoryService
+    with pytest.raises(ValueError, match="Quantity must be positive"):
+        InventoryService(db).restock_sweet(sweet.id, 0, user_id=1)
+
+
+def test_get_inventory_history_filters_and_pages(db):
+    """Test history is filtered by time range and action and paged by cursor"""
+    from datetime import datetime, timedelta
+    from app.services.inventory_service import InventoryService
+    from app.repositories.sweet_repository import SweetRepository
+    from app.models.inventory_log import InventoryLog
+    
+    sweet = SweetRepository(db).create(name="Jalebi", price=1.0, category="Indian")
+    start = datetime(2026, 1, 1)
+    db.add_all(
+        InventoryLog(sweet_id=sweet.id, action="RESTOCK" if i % 2 else "PURCHASE",
+                     quantity_change=1, performed_by=1, created_at=start + timedelta(hours=i))
+        for i in range(10)
+    )
+    db.commit()
+    inventory_service = InventoryService(db)
+    
+    logs, next_cursor = inventory_service.get_inventory_history(
+        sweet.id, since=start + timedelta(hours=2), until=start + timedelta(hours=8),
+        action="restock", limit=2
+    )
+    assert [log.created_at.hour for log in logs] == [7, 5]
+    
+    logs, next_cursor = inventory_service.get_inventory_history(
+        sweet.id, since=start + timedelta(hours=2), until=start + timedelta(hours=8),
+        action="restock", limit=2, cursor=next_cursor
+    )
+    assert [log.created_at.hour for log in logs] == [3]
+    assert next_cursor is None
+    
+    from app.utils.pagination import encode_cursor
+    for cursor in [encode_cursor("created_at", 5, 1), encode_cursor("created_at", "yesterday", 1),
+                   encode_cursor("purchase_date", start.isoformat(), 1)]:
+        with pytest.raises(ValueError, match="Invalid cursor"):
+            inventory_service.get_inventory_history(sweet.id, cursor=cursor)
+
+
+def test_purchases_roll_up_into_daily_sales(db, test_sweet_data):
+    """Test purchases and checkouts add onto one daily rollup row per sweet"""
+    from app.services.sweet_service import SweetService
+    from app.services.inventory_service import InventoryService
+    from app.services.sales_service import SalesService
+    from app.schemas.sweet import SweetCreate
+    
+    sweet = SweetService(db).create_sweet(SweetCreate(**test_sweet_data))
+    inventory_service = InventoryService(db)
+    
+    inventory_service.purchase_sweet(user_id=1, sweet_id=sweet.id, quantity=2)
+    inventory_service.checkout(user_id=1, items=[{"sweet_id": sweet.id, "quantity": 3}])
+    with pytest.raises(ValueError):
+        inventory_service.purchase_sweet(user_id=1, sweet_id=sweet.id, quantity=50)
+    
+    sales_service = SalesService(db)
+    _, _, summary = sales_service.get_summary()
+    _, _, days = sales_service.get_daily(sweet_id=sweet.id)
+    _, _, sweets = sales_service.get_by_sweet()
+    
+    assert summary == {"units": 5, "revenue": pytest.approx(5 * 5.99), "purchases": 2}
+    assert len(days) == 1 and days[0]["units"] == 5
+    assert sweets[0]["sweet_name"] == test_sweet_data["name"]
+    
+    with pytest.raises(ValueError):
+        sales_service.get_summary(start=days[0]["sale_date"], end=days[0]["sale_date"].replace(year=2000))
+
+
+def test_group_commit_writer_survives_session_errors(db, test_sweet_data):
+    """Test a failing session factory fails the batch without killing the writer"""
+    from app.services.sweet_service import SweetService
+    from app.services.group_commit import GroupCommitWriter
+    from app.schemas.sweet import SweetCreate
+    from app.utils.exceptions import ServiceUnavailableException
+    from tests.conftest import TestingSessionLocal
+    
+    sweet = SweetService(db).create_sweet(SweetCreate(**test_sweet_data))
+    sessions = iter([RuntimeError("database unavailable")])
+    
+    def flaky_session_factory(**kwargs):
+        error = next(sessions, None)
+        if error is not None:
+            raise error
+        return TestingSessionLocal(**kwargs)
+    
+    writer = GroupCommitWriter(session_factory=flaky_session_factory, max_delay_ms=0, result_timeout=5)
+    try:
+        with pytest.raises(RuntimeError, match="database unavailable"):
+            writer.purchase_sweet(user_id=1, sweet_id=sweet.id, quantity=1)
+        assert writer.purchase_sweet(user_id=1, sweet_id=sweet.id, quantity=1).quantity == 1
+    finally:
+        writer.stop()
+    
+    # A writer that never picks work up makes callers give up rather than hang
+    stalled = GroupCommitWriter(session_factory=TestingSessionLocal, result_timeout=0.05)
+    stalled.start = lambda: None
+    with pytest.raises(ServiceUnavailableException):
+        stalled.purchase_sweet(user_id=1, sweet_id=sweet.id, quantity=1)
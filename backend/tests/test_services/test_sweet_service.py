@@ -26,3 +26,148 @@ def test_sweet_service_get_all(db, test_sweet_data):
     
     sweets = sweet_service.get_all_sweets()
     assert len(sweets) > 0
+
+
+def test_sweet_service_cache_invalidation(db, test_sweet_data):
+    """Test cached reads are served until a write invalidates them"""
+    from app.services.sweet_service import SweetService, catalog_cache
+    from app.services.inventory_service import InventoryService
+    from app.schemas.sweet import SweetCreate
+    
+    sweet_service = SweetService(db)
+    sweet = sweet_service.create_sweet(SweetCreate(**test_sweet_data))
+    
+    assert sweet_service.get_sweet_by_id(sweet.id).quantity == 10
+    hits = catalog_cache.hits
+    assert sweet_service.get_sweet_by_id(sweet.id).quantity == 10
+    assert catalog_cache.hits == hits + 1
+    
+    InventoryService(db).restock_sweet(sweet.id, 5, user_id=1)
+    assert sweet_service.get_sweet_by_id(sweet.id).quantity == 15
+
+
+def test_catalog_import(db):
+    """Test bulk import upserts by id and name and reports bad rows"""
+    import io
+    from app.services.catalog_import_service import CatalogImportService, iter_csv_rows
+    from app.repositories.sweet_repository import SweetRepository
+    
+    sweet_repo = SweetRepository(db)
+    existing = sweet_repo.create(name="Laddu", price=1.0, quantity=5, category="Balls")
+    
+    csv_data = (
+        "id,name,category,price,quantity\n"
+        f"{existing.id},Laddu,Balls,2.5,50\n"
+        ",Barfi,Fudge,3.0,10\n"
+        ",Peda,Fudge,not-a-price,10\n"
+        ",Barfi,Fudge,3.5,12\n"
+        ",Kheer,,1.0,1\n"
+    )
+    report = CatalogImportService(db).import_rows(iter_csv_rows(io.StringIO(csv_data)), batch_size=2)
+    
+    assert report["inserted"] == 1
+    assert report["updated"] == 2
+    assert [error["line"] for error in report["errors"]] == [4, 6]
+    
+    db.expire_all()
+    assert float(sweet_repo.get_by_id(existing.id).price) == 2.5
+    barfi = sweet_repo.search("barfi")
+    assert len(barfi) == 1 and barfi[0].quantity == 12
+
+
+def test_catalog_import_partial_columns(db):
+    """Test an import only overwrites the columns its file has"""
+    import io
+    from app.services.catalog_import_service import CatalogImportService, iter_csv_rows, iter_ndjson_rows
+    from app.repositories.sweet_repository import SweetRepository
+    
+    sweet_repo = SweetRepository(db)
+    laddu = sweet_repo.create(
+        name="Laddu", price=1.0, quantity=50, category="Balls",
+        description="Gram flour", image_url="laddu.png"
+    )
+    barfi = sweet_repo.create(name="Barfi", price=2.0, quantity=7, category="Fudge", description="Milk")
+    
+    csv_data = "name,category,price\nLaddu,Balls,1.5\n"
+    report = CatalogImportService(db).import_rows(iter_csv_rows(io.StringIO(csv_data)))
+    ndjson = f'{{"id": {barfi.id}, "name": "Barfi", "category": "Fudge", "price": 2.25, "quantity": 9}}\n'
+    CatalogImportService(db).import_rows(iter_ndjson_rows(io.StringIO(ndjson)))
+    
+    assert report["updated"] == 1
+    db.expire_all()
+    laddu = sweet_repo.get_by_id(laddu.id)
+    assert float(laddu.price) == 1.5
+    assert (laddu.quantity, laddu.description, laddu.image_url) == (50, "Gram flour", "laddu.png")
+    barfi = sweet_repo.get_by_id(barfi.id)
+    assert (float(barfi.price), barfi.quantity, barfi.description) == (2.25, 9, "Milk")
+
+
+def test_bulk_update_sweets(db):
+    """Test bulk updates by id and by filter plus patch"""
+    from app.services.sweet_service import SweetService
+    from app.repositories.sweet_repository import SweetRepository
+    from app.schemas.sweet import SweetBulkUpdate
+    
+    sweet_repo = SweetRepository(db)
+    cake = sweet_repo.create(name="Sponge", price=10.0, quantity=1, category="Cakes")
+    tart = sweet_repo.create(name="Tart", price=4.0, quantity=1, category="Cakes")
+    fudge = sweet_repo.create(name="Fudge", price=2.0, quantity=1, category="Fudge")
+    sweet_service = SweetService(db)
+    
+    result = sweet_service.bulk_update_sweets(SweetBulkUpdate(items=[
+        {"id": cake.id, "quantity": 7},
+        {"id": fudge.id, "name": "Vanilla Fudge", "price": 2.5},
+        {"id": 9999, "quantity": 1}
+    ]))
+    assert result == {"updated": 2, "missing": [9999]}
+    
+    result = sweet_service.bulk_update_sweets(SweetBulkUpdate(
+        filter={"category": "Cakes"}, patch={"price_multiplier": 1.1}
+    ))
+    assert result["updated"] == 2
+    
+    db.expire_all()
+    assert sweet_repo.get_by_id(cake.id).quantity == 7
+    assert float(sweet_repo.get_by_id(cake.id).price) == 11.0
+    assert float(sweet_repo.get_by_id(tart.id).price) == 4.4
+    assert float(sweet_repo.get_by_id(fudge.id).price) == 2.5
+    assert sweet_repo.search("vanilla")[0].id == fudge.id
+    
+    with pytest.raises(ValueError):
+        sweet_service.bulk_update_sweets(SweetBulkUpdate(filter={}, patch={"quantity": 0}))
+
+
+def test_concurrent_reads_share_one_load(db, test_sweet_data, monkeypatch):
+    """Test identical concurrent cache misses run a single query"""
+    import time
+    from concurrent.futures import ThreadPoolExecutor
+    from app.services.sweet_service import SweetService, catalog_cache, catalog_flight
+    from app.repositories.sweet_repository import SweetRepository
+    from app.schemas.sweet import SweetCreate
+    
+    sweet = SweetService(db).create_sweet(SweetCreate(**test_sweet_data))
+    loads = []
+    get_by_id = SweetRepository.get_by_id
+    
+    def slow_get_by_id(self, sweet_id):
+        loads.append(sweet_id)
+        time.sleep(0.2)
+        return get_by_id(self, sweet_id)
+    
+    monkeypatch.setattr(SweetRepository, "get_by_id", slow_get_by_id)
+    collapsed = catalog_flight.collapsed
+    
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        results = list(pool.map(lambda _: SweetService(db).get_sweet_by_id(sweet.id), range(8)))
+    
+    assert loads == [sweet.id]
+    assert all(result.name == test_sweet_data["name"] for result in results)
+    assert catalog_flight.collapsed - collapsed == 7
+    
+    # A load that overlaps a write is returned but not cached
+    def load_then_clear():
+        catalog_cache.clear()
+        return "stale"
+    
+    assert catalog_cache.get_or_load(("probe",), load_then_clear) == "stale"
+    assert catalog_cache.get(("probe",)) is None
@@ -1,4 +1,6 @@
 import pytest
+from datetime import datetime, timedelta
+from app.services.sweet_service import catalog_cache
 
 
 def test_get_sweets(client):
@@ -21,3 +23,265 @@ def test_get_sweet_not_found(client):
     """Test getting non-existent sweet"""
     response = client.get("/api/v1/sweets/999")
     assert response.status_code == 404
+
+
+def test_search_sweets(client, db):
+    """Test full-text search combined with category and price filters"""
+    from app.repositories.sweet_repository import SweetRepository
+    
+    sweet_repo = SweetRepository(db)
+    sweet_repo.create(name="Chocolate Cake", price=5.99, category="Cakes", description="Rich cocoa sponge")
+    sweet_repo.create(name="Chocolate Bar", price=1.99, category="Chocolates")
+    sweet_repo.create(name="Gulab Jamun", price=2.50, category="Indian", description="Soaked in syrup")
+    
+    response = client.get("/api/v1/sweets/search", params={"q": "choc"})
+    assert response.status_code == 200
+    assert {s["name"] for s in response.json()} == {"Chocolate Cake", "Chocolate Bar"}
+    
+    response = client.get("/api/v1/sweets/search", params={"q": "choc", "max_price": 3})
+    assert [s["name"] for s in response.json()] == ["Chocolate Bar"]
+    
+    response = client.get("/api/v1/sweets/search", params={"q": "syrup", "category": "Indian"})
+    assert [s["name"] for s in response.json()] == ["Gulab Jamun"]
+
+
+def test_search_sweets_follows_updates(db):
+    """Test the search index is kept in sync with updates and deletes"""
+    from app.repositories.sweet_repository import SweetRepository
+    
+    sweet_repo = SweetRepository(db)
+    sweet = sweet_repo.create(name="Ladoo", price=1.50, category="Indian")
+    
+    sweet_repo.update(sweet, {"name": "Motichoor Ladoo"})
+    assert [s.id for s in sweet_repo.search("motichoor")] == [sweet.id]
+    
+    sweet_repo.delete(sweet)
+    assert sweet_repo.search("ladoo") == []
+
+
+def test_get_sweets_cursor_pagination(client, db):
+    """Test keyset pagination walks every sweet exactly once"""
+    from app.repositories.sweet_repository import SweetRepository
+    
+    sweet_repo = SweetRepository(db)
+    for i, price in enumerate([3.0, 1.0, 2.0, 1.0, 5.0]):
+        sweet_repo.create(name=f"Sweet {i}", price=price, category="Candy")
+    
+    seen = []
+    params = {"order_by": "price", "limit": 2}
+    while True:
+        response = client.get("/api/v1/sweets/", params=params)
+        assert response.status_code == 200
+        body = response.json()
+        seen.extend(s["price"] for s in body["data"])
+        if not body["next_cursor"]:
+            break
+        params = {"cursor": body["next_cursor"], "limit": 2}
+    
+    assert seen == [1.0, 1.0, 2.0, 3.0, 5.0]
+
+
+def test_get_sweets_sparse_fields(client, db):
+    """Test fields= returns only the requested fields, plus id"""
+    from app.repositories.sweet_repository import SweetRepository
+    
+    sweet_repo = SweetRepository(db)
+    sweet = sweet_repo.create(name="Toffee", price=2.0, quantity=4, category="Candy", description="Chewy")
+    sweet_repo.create(name="Fudge", price=1.0, category="Candy")
+    
+    response = client.get("/api/v1/sweets/", params={"fields": "name,price"})
+    assert response.json()[0] == {"id": sweet.id, "name": "Toffee", "price": 2.0}
+    
+    response = client.get("/api/v1/sweets/", params={"fields": "name", "order_by": "price", "limit": 1})
+    body = response.json()
+    assert body["data"] == [{"id": sweet.id + 1, "name": "Fudge"}]
+    assert body["next_cursor"]
+    
+    response = client.get(f"/api/v1/sweets/{sweet.id}", params={"fields": "quantity"})
+    assert response.json() == {"id": sweet.id, "quantity": 4}
+    
+    response = client.get("/api/v1/sweets/search", params={"q": "toffee", "fields": "description"})
+    assert response.json() == [{"id": sweet.id, "description": "Chewy"}]
+    
+    response = client.get("/api/v1/sweets/", params={"fields": "name,secret"})
+    assert response.status_code == 400
+
+
+def test_get_sweets_conditional(client, db):
+    """Test unchanged catalog reads revalidate with a 304"""
+    from app.repositories.sweet_repository import SweetRepository
+    from app.services.inventory_service import InventoryService
+    
+    sweet = SweetRepository(db).create(name="Mint", price=1.0, quantity=5, category="Candy")
+    
+    response = client.get("/api/v1/sweets/")
+    etag = response.headers["etag"]
+    assert client.get("/api/v1/sweets/", headers={"If-None-Match": etag}).status_code == 304
+    assert client.get("/api/v1/sweets/", params={"limit": 5}, headers={"If-None-Match": etag}).status_code == 200
+    
+    # Last-Modified is withheld until it is a second old
+    item = client.get(f"/api/v1/sweets/{sweet.id}")
+    assert item.json()["name"] == "Mint"
+    assert "last-modified" not in item.headers
+    SweetRepository(db).update(sweet, {"updated_at": datetime.utcnow() - timedelta(hours=1)})
+    catalog_cache.clear()
+    
+    item = client.get(f"/api/v1/sweets/{sweet.id}")
+    response = client.get(f"/api/v1/sweets/{sweet.id}", headers={"If-Modified-Since": item.headers["last-modified"]})
+    assert response.status_code == 304 and response.content == b""
+    
+    InventoryService(db).restock_sweet(sweet.id, 1, user_id=1)
+    assert client.get("/api/v1/sweets/", headers={"If-None-Match": etag}).status_code == 200
+    response = client.get(f"/api/v1/sweets/{sweet.id}", headers={"If-None-Match": item.headers["etag"]})
+    assert response.status_code == 200 and response.json()["quantity"] == 6
+    response = client.get(f"/api/v1/sweets/{sweet.id}", headers={"If-Modified-Since": item.headers["last-modified"]})
+    assert response.status_code == 200
+
+
+def test_get_sweets_conditional_after_delete(client, db):
+    """Test a delete changes the catalog ETag though the latest updated_at stays put"""
+    from app.repositories.sweet_repository import SweetRepository
+    
+    sweet_repo = SweetRepository(db)
+    sweet_repo.create(name="Mint", price=1.0, quantity=5, category="Candy")
+    toffee = sweet_repo.create(name="Toffee", price=1.0, quantity=5, category="Candy")
+    sweet_repo.update(toffee, {"updated_at": datetime.utcnow() - timedelta(hours=1)})
+    
+    response = client.get("/api/v1/sweets/")
+    assert "last-modified" not in response.headers
+    
+    sweet_repo.delete(toffee)
+    catalog_cache.clear()
+    response = client.get("/api/v1/sweets/", headers={"If-None-Match": response.headers["etag"]})
+    assert response.status_code == 200
+    assert [s["name"] for s in response.json()] == ["Mint"]
+
+
+def test_get_sweet_changes(client, db):
+    """Test delta sync returns creates, updates and deletes since a version"""
+    from app.repositories.sweet_repository import SweetRepository
+    
+    sweet_repo = SweetRepository(db)
+    toffee = sweet_repo.create(name="Toffee", price=2.0, category="Candy")
+    fudge = sweet_repo.create(name="Fudge", price=1.0, category="Candy")
+    
+    body = client.get("/api/v1/sweets/changes", params={"limit": 1}).json()
+    assert [change["name"] for change in body["data"]] == ["Toffee"] and body["has_more"]
+    body = client.get("/api/v1/sweets/changes", params={"since": body["version"]}).json()
+    assert [change["name"] for change in body["data"]] == ["Fudge"] and not body["has_more"]
+    since = body["version"]
+    
+    sweet_repo.update(toffee, {"price": 2.5})
+    sweet_repo.delete(fudge)
+    body = client.get("/api/v1/sweets/changes", params={"since": since}).json()
+    assert [(change["id"], change["deleted"]) for change in body["data"]] == [(toffee.id, False), (fudge.id, True)]
+    assert body["data"][0]["price"] == 2.5
+    
+    body = client.get("/api/v1/sweets/changes", params={"since": body["version"]}).json()
+    assert body["data"] == []
+
+
+def test_get_sweets_async_session(client, db):
+    """Test the catalog list reads through AsyncSweetService when given an AsyncSession"""
+    from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
+    from app.main import app
+    from app.database import get_catalog_db
+    from app.repositories.sweet_repository import SweetRepository
+    
+    sweet_repo = SweetRepository(db)
+    for price in (3.0, 1.0, 2.0):
+        sweet_repo.create(name=f"Sweet {price}", price=price, category="Candy")
+    
+    sync_list = client.get("/api/v1/sweets/", params={"fields": "id,price"}).json()
+    sync_page = client.get("/api/v1/sweets/", params={"order_by": "price", "limit": 2}).json()
+    catalog_cache.clear()
+    
+    async def override_get_catalog_db():
+        async_engine = create_async_engine("sqlite+aiosqlite:///./test.db")
+        async with async_sessionmaker(async_engine, expire_on_commit=False)() as session:
+            yield session
+        await async_engine.dispose()
+    
+    previous = app.dependency_overrides[get_catalog_db]
+    app.dependency_overrides[get_catalog_db] = override_get_catalog_db
+    try:
+        assert client.get("/api/v1/sweets/", params={"fields": "id,price"}).json() == sync_list
+        page = client.get("/api/v1/sweets/", params={"order_by": "price", "limit": 2}).json()
+        assert page == sync_page
+        assert [sweet["price"] for sweet in page["data"]] == [1.0, 2.0]
+        
+        response = client.get("/api/v1/sweets/", params={"cursor": page["next_cursor"]})
+        assert [sweet["price"] for sweet in response.json()["data"]] == [3.0]
+    finally:
+        app.dependency_overrides[get_catalog_db] = previous
+
+
+def test_get_sweets_invalid_cursor(client):
+    """Test malformed and tampered cursors and out-of-range limits are rejected"""
+    import base64
+    
+    response = client.get("/api/v1/sweets/", params={"cursor": "not-a-cursor"})
+    assert response.status_code == 400
+    
+    for payload in [b'{"k":"price","v":[1],"id":1}', b'{"k":"id","v":1,"id":"1"}', b'{"k":1,"v":1,"id":1}']:
+        cursor = base64.urlsafe_b64encode(payload).decode().rstrip("=")
+        assert client.get("/api/v1/sweets/", params={"cursor": cursor}).status_code == 400
+    
+    for limit in (0, -1):
+        response = client.get("/api/v1/sweets/", params={"order_by": "id", "limit": limit})
+        assert response.status_code == 422
+
+
+def test_export_sweets(client, db):
+    """Test the catalog streams as NDJSON and gzipped CSV"""
+    import json
+    from app.repositories.sweet_repository import SweetRepository
+    from app.repositories.user_repository import UserRepository
+    from app.utils.security import create_access_token
+    
+    UserRepository(db).update(
+        UserRepository(db).create(username="exporter", email="exporter@example.com", hashed_password="x"),
+        {"is_admin": True}
+    )
+    sweet_repo = SweetRepository(db)
+    for i in range(3):
+        sweet_repo.create(name=f"Sweet {i}", price=1.25, quantity=i, category="Candy")
+    headers = {"Authorization": f"Bearer {create_access_token(data={'sub': 'exporter'})}"}
+    
+    response = client.get("/api/v1/sweets/export", headers=headers)
+    assert response.status_code == 200
+    rows = [json.loads(line) for line in response.text.splitlines()]
+    assert [row["name"] for row in rows] == ["Sweet 0", "Sweet 1", "Sweet 2"]
+    assert rows[0]["price"] == 1.25
+    
+    response = client.get("/api/v1/sweets/export", params={"format": "csv", "gzip": True}, headers=headers)
+    assert response.headers["content-encoding"] == "gzip"
+    lines = response.text.splitlines()
+    assert lines[0].startswith("id,name,category,price")
+    assert len(lines) == 4
+
+
+def test_bulk_update_empty_ids_matches_nothing(client, db):
+    """Test a filter with an empty id list updates no sweets"""
+    from app.repositories.sweet_repository import SweetRepository
+    from app.repositories.user_repository import UserRepository
+    from app.utils.security import create_access_token
+    
+    UserRepository(db).update(
+        UserRepository(db).create(username="manager", email="manager@example.com", hashed_password="x"),
+        {"is_admin": True}
+    )
+    sweet_repo = SweetRepository(db)
+    for i in range(3):
+        sweet_repo.create(name=f"Sweet {i}", price=1.25, quantity=5, category="Candy")
+    headers = {"Authorization": f"Bearer {create_access_token(data={'sub': 'manager'})}"}
+    
+    response = client.patch(
+        "/api/v1/sweets/bulk",
+        json={"filter": {"ids": []}, "patch": {"quantity": 0}},
+        headers=headers
+    )
+    assert response.status_code == 200
+    assert response.json()["data"]["updated"] == 0
+    db.expire_all()
+    assert [sweet.quantity for sweet in sweet_repo.get_all()] == [5, 5, 5]
@@ -37,10 +37,10 @@ export const Cart: React.FC<CartProps> = ({ onCheckoutSuccess }) => {
     setError('');
 
     try {
-      // Process each item in cart
-      for (const item of cartItems) {
-        await inventoryService.purchase(item.sweet.id, item.quantity);
-      }
+      // Purchase the whole cart in one transaction
+      await inventoryService.checkout(
+        cartItems.map((item) => ({ sweetId: item.sweet.id, quantity: item.quantity }))
+      );
 
       setMessage('Checkout successful!');
       clearCart();
@@ -26,6 +26,17 @@ export const Home: React.FC = () => {
     loadSweets();
   }, []);
 
+  // Keep stock levels live instead of refetching the whole list
+  useEffect(() => {
+    return inventoryService.subscribeToStock(
+      ({ sweet_id, quantity }) =>
+        setSweets((current) =>
+          current.map((sweet) => (sweet.id === sweet_id ? { ...sweet, quantity } : sweet))
+        ),
+      loadSweets
+    );
+  }, []);
+
   useEffect(() => {
     filterSweets();
   }, [sweets, searchQuery, selectedCategory]);
@@ -1,5 +1,5 @@
 import api from './api';
-import { PurchaseResponse, PurchaseHistory, InventoryLog } from '../types/purchase';
+import { PurchaseResponse, CheckoutResponse, PurchaseHistory, InventoryLog, StockUpdate } from '../types/purchase';
 
 export const inventoryService = {
   /**
@@ -18,6 +18,22 @@ export const inventoryService = {
     }
   },
 
+  /**
+   * Purchase every item in the cart in a single all-or-nothing request
+   */
+  async checkout(items: { sweetId: number; quantity: number }[]): Promise<CheckoutResponse> {
+    try {
+      const response = await api.post<CheckoutResponse>(
+        `/inventory/checkout`,
+        { items: items.map((item) => ({ sweet_id: item.sweetId, quantity: item.quantity })) }
+      );
+      return response.data;
+    } catch (error) {
+      console.error('Error checking out cart:', error);
+      throw error;
+    }
+  },
+
   /**
    * Restock a sweet (Admin only)
    */
@@ -47,9 +63,17 @@ export const inventoryService = {
         );
         return response.data;
       }
-      // Get all user purchases
-      const response = await api.get<any>('/inventory/purchases');
-      return response.data?.data || [];
+      // Get all user purchases, following the cursor one page at a time
+      const purchases: PurchaseHistory[] = [];
+      let cursor: string | null = null;
+      do {
+        const response = await api.get<any>('/inventory/purchases', {
+          params: { limit: 1000, ...(cursor ? { cursor } : {}) },
+        });
+        purchases.push(...(response.data?.data || []));
+        cursor = response.data?.next_cursor || null;
+      } while (cursor);
+      return purchases;
     } catch (error) {
       console.error('Error fetching purchase history:', error);
       return [];
@@ -68,6 +92,19 @@ export const inventoryService = {
     }
   },
 
+  /**
+   * Subscribe to live stock levels; returns a function that closes the stream.
+   * `onResync` is called when updates were dropped and the list should be refetched.
+   */
+  subscribeToStock(onUpdate: (update: StockUpdate) => void, onResync: () => void): () => void {
+    const source = new EventSource(`${api.defaults.baseURL}/inventory/stock/stream`);
+    source.addEventListener('stock', (event) => {
+      onUpdate(JSON.parse((event as MessageEvent).data));
+    });
+    source.addEventListener('resync', onResync);
+    return () => source.close();
+  },
+
   /**
    * Get inventory logs (Admin only)
    */
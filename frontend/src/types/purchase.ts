@@ -16,6 +16,13 @@ export interface PurchaseResponse {
   data?: Purchase;
 }
 
+export interface CheckoutResponse {
+  success: boolean;
+  message: string;
+  data: Purchase[];
+  total_price: number;
+}
+
 export interface InventoryLog {
   id: number;
   sweet_id: number;
@@ -26,6 +33,11 @@ export interface InventoryLog {
   created_at: string;
 }
 
+export interface StockUpdate {
+  sweet_id: number;
+  quantity: number;
+}
+
 export interface CartItem {
   sweet: any;
   quantity: number;